@@ -1,8 +1,15 @@
 import pandas as pd
 import numpy as np
-import glob
 import os
-from scipy.stats import linregress
+import sys
+
+from metrics import stack_errors, compute_metrics, classify
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import trajstore
 
 # =============================
 # CONFIG
@@ -12,7 +19,8 @@ REBOUND_DIR  = "results/rebound"
 MANUAL_DIR   = "results/manual"
 
 OUTPUT_DIR   = "results/analysis/unified"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+SUMMARY_FILE = "Unified_Model_Comparison_Advanced.csv"
+CHAOS_FILE   = "Chaos_Indicators.csv"
 
 ROLLING_WINDOW = 50
 ANOMALY_Z = 3.0
@@ -28,26 +36,22 @@ def normalize_date(series):
         series.str.replace("A.D. ", "", regex=False)
     ).dt.date
 
-summary = []
-
-rebound_files = glob.glob(f"{REBOUND_DIR}/*_Rebound.csv")
-
-for rebound_path in rebound_files:
+def compare_object(name, real_dir=REAL_DIR, rebound_dir=REBOUND_DIR, manual_dir=MANUAL_DIR, output_dir=OUTPUT_DIR):
+    """Merge one object's three trajectories, save the detailed table and return
+    (rebound, manual) radial error series, or None if inputs are missing / too short"""
+    rebound_path = os.path.join(rebound_dir, f"{name}_Rebound.csv")
+    real_path   = os.path.join(real_dir, f"{name}_Real.csv")
+    manual_path = os.path.join(manual_dir, f"{name}.csv")
 
-    name = os.path.basename(rebound_path).replace("_Rebound.csv", "")
-
-    real_path   = os.path.join(REAL_DIR, f"{name}_Real.csv")
-    manual_path = os.path.join(MANUAL_DIR, f"{name}.csv")
-
-    if not (os.path.exists(real_path) and os.path.exists(manual_path)):
-        continue
+    if not (trajstore.exists(rebound_path) and trajstore.exists(real_path) and trajstore.exists(manual_path)):
+        return None
 
     # --------------------------
     # LOAD DATA
     # --------------------------
-    rebound = pd.read_csv(rebound_path)
-    real    = pd.read_csv(real_path)
-    manual  = pd.read_csv(manual_path)
+    rebound = trajstore.read_table(rebound_path)
+    real    = trajstore.read_table(real_path)
+    manual  = trajstore.read_table(manual_path)
 
     rebound["date"] = normalize_date(rebound["datetime_str"])
     real["date"]    = normalize_date(real["datetime_str"])
@@ -78,7 +82,7 @@ for rebound_path in rebound_files:
     df.rename(columns={"r":"r_manual","v":"v_manual"}, inplace=True)
 
     if len(df) < 10:
-        continue
+        return None
 
     # --------------------------
     # ERROR COMPUTATION
@@ -87,74 +91,93 @@ for rebound_path in rebound_files:
     df["delta_r_manual"]  = abs(df["r_manual"]  - df["r_real"])
 
     # --------------------------
-    # METRIC FUNCTION
+    # SAVE PER OBJECT
     # --------------------------
-    def compute_metrics(series):
-        rms = np.sqrt(np.mean(series**2))
-
-        t = np.arange(len(series))
-        slope, _, r_val, _, _ = linregress(t, series)
-        r_squared = r_val**2
-
-        ratio = series.iloc[-1] / series.iloc[0] if series.iloc[0] != 0 else 1
-        volatility = series.std() / series.mean()
+    df.to_csv(
+        f"{output_dir}/{name}_Detailed_Comparison.csv",
+        index=False
+    )
 
-        return rms, ratio, volatility, r_squared
+    return df["delta_r_rebound"].to_numpy(), df["delta_r_manual"].to_numpy()
 
-    rms_r_reb, ratio_reb, vol_reb, r2_reb = compute_metrics(df["delta_r_rebound"])
-    rms_r_man, ratio_man, vol_man, r2_man = compute_metrics(df["delta_r_manual"])
 
+def build_summary(names, rebound_errors, manual_errors):
+    """Unified summary table from the stacked error series"""
     # --------------------------
-    # BEHAVIOR CLASSIFIER
+    # METRICS (all objects at once)
     # --------------------------
-    def classify(ratio, volatility, r2):
-        if ratio < 1.5 and volatility < 0.5:
-            return "Stable"
-        elif ratio < 3 and r2 > 0.7:
-            return "Linear Drift"
-        elif volatility > 1.0:
-            return "Oscillatory"
-        elif ratio >= 3:
-            return "Runaway Divergence"
-        else:
-            return "Mixed"
-
-    class_reb = classify(ratio_reb, vol_reb, r2_reb)
-    class_man = classify(ratio_man, vol_man, r2_man)
+    reb = compute_metrics(stack_errors(rebound_errors))
+    man = compute_metrics(stack_errors(manual_errors))
 
-    # --------------------------
-    # SAVE PER OBJECT
-    # --------------------------
-    df.to_csv(
-        f"{OUTPUT_DIR}/{name}_Detailed_Comparison.csv",
-        index=False
-    )
+    summary = pd.DataFrame({
+        "object": names,
+
+        "rebound_rms_error": reb["rms"],
+        "manual_rms_error": man["rms"],
 
-    summary.append({
-        "object": name,
+        "rebound_ratio": reb["ratio"],
+        "manual_ratio": man["ratio"],
 
-        "rebound_rms_error": rms_r_reb,
-        "manual_rms_error": rms_r_man,
+        "rebound_volatility": reb["volatility"],
+        "manual_volatility": man["volatility"],
 
-        "rebound_ratio": ratio_reb,
-        "manual_ratio": ratio_man,
+        "rebound_slope": reb["slope"],
+        "manual_slope": man["slope"],
 
-        "rebound_volatility": vol_reb,
-        "manual_volatility": vol_man,
+        "rebound_r2": reb["r_squared"],
+        "manual_r2": man["r_squared"],
 
-        "rebound_class": class_reb,
-        "manual_class": class_man,
+        "rebound_class": classify(reb["ratio"], reb["volatility"], reb["r_squared"]),
+        "manual_class": classify(man["ratio"], man["volatility"], man["r_squared"]),
 
-        "better_model": "Manual (GPU)" if rms_r_man < rms_r_reb else "Rebound"
+        "better_model": np.where(man["rms"] < reb["rms"], "Manual (GPU)", "Rebound")
     })
 
-# --------------------------
-# SAVE SUMMARY
-# --------------------------
-summary_df = pd.DataFrame(summary)
-summary_df.to_csv(
-    f"{OUTPUT_DIR}/Unified_Model_Comparison_Advanced.csv",
-    index=False
-)
+    return summary
+
+
+def run(real_dir=REAL_DIR, rebound_dir=REBOUND_DIR, manual_dir=MANUAL_DIR, output_dir=OUTPUT_DIR,
+        names=None, summary_file=SUMMARY_FILE):
+    """Three-way comparison (Horizons vs Rebound vs manual GPU) and unified summary.
+
+    names restricts the run to those objects (default: every *_Rebound.csv).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if names is None:
+        rebound_files = trajstore.list_tables(rebound_dir, "_Rebound.csv")
+        names = [os.path.basename(path).replace("_Rebound.csv", "") for path in rebound_files]
+
+    kept = []
+    rebound_errors = []
+    manual_errors = []
+
+    for name in names:
+        errors = compare_object(name, real_dir, rebound_dir, manual_dir, output_dir)
+        if errors is None:
+            continue
+        kept.append(name)
+        rebound_errors.append(errors[0])
+        manual_errors.append(errors[1])
+
+    summary = build_summary(kept, rebound_errors, manual_errors)
+
+    # MEGNO / Lyapunov columns from the last chaos run (src/chaos.py), if any
+    chaos_path = os.path.join(output_dir, CHAOS_FILE)
+    if os.path.exists(chaos_path):
+        summary = summary.merge(pd.read_csv(chaos_path), on="object", how="left")
+
+    # --------------------------
+    # SAVE SUMMARY
+    # --------------------------
+    summary.to_csv(
+        os.path.join(output_dir, summary_file),
+        index=False
+    )
+
+    print("Unified advanced comparison complete.")
+    return summary
+
 
-print("Unified advanced comparison complete.")
\ No newline at end of file
+if __name__ == "__main__":
+    run()
@@ -1,115 +1,127 @@
-import os
-import pandas as pd
-
-BASE_DIR = r"C:\Users\JASMINE\Desktop\RnD_asteroid"
-
-GPU_SUMMARY_PATH = os.path.join(
-    BASE_DIR,
-    "results",
-    "zscore",
-    "_manual",
-    "ZScore_Summary_XAI.csv"
-)
-
-REBOUND_SUMMARY_PATH = os.path.join(
-    BASE_DIR,
-    "results",
-    "zscore",
-    "_rebound",
-    "Rebound_vs_Real_Summary.csv"
-)
-
-OUTPUT_PATH = os.path.join(
-    BASE_DIR,
-    "results",
-    "zscore",
-    "model_comparison_summary.csv"
-)
-# =============================
-# LOAD SUMMARIES
-# =============================
-gpu_df = pd.read_csv(GPU_SUMMARY_PATH)
-rebound_df = pd.read_csv(REBOUND_SUMMARY_PATH)
-
-# Rename columns for clarity
-gpu_df = gpu_df.rename(columns={
-    "max_z_score": "gpu_max_z",
-    "anomaly_count": "gpu_anomaly_count",
-    "stability_class": "gpu_stability_class",
-    "mean_delta_r": "gpu_mean_delta_r",
-    "mean_delta_v": "gpu_mean_delta_v"
-})
-
-rebound_df = rebound_df.rename(columns={
-    "max_z_score": "rebound_max_z",
-    "anomaly_count": "rebound_anomaly_count",
-    "stability_class": "rebound_stability_class",
-    "mean_delta_r": "rebound_mean_delta_r",
-    "mean_delta_v": "rebound_mean_delta_v"
-})
-
-# =============================
-# MERGE
-# =============================
-comparison = gpu_df.merge(rebound_df, on="object", how="inner")
-
-# =============================
-# PERFORMANCE METRICS
-# =============================
+"""GPU (manual) vs Rebound model comparison from the two z-score summaries.
 
-# Absolute improvement (positive = Rebound better)
-comparison["delta_mean_r_difference"] = (
-    comparison["gpu_mean_delta_r"] - comparison["rebound_mean_delta_r"]
-)
+Usage:
+    python analysis/comparision.py
+    python src/cli.py compare --models
+"""
 
-comparison["delta_mean_v_difference"] = (
-    comparison["gpu_mean_delta_v"] - comparison["rebound_mean_delta_v"]
-)
+import os
+import sys
+import numpy as np
+import pandas as pd
 
-# Percentage improvement
-comparison["r_improvement_percent"] = (
-    comparison["delta_mean_r_difference"] /
-    comparison["gpu_mean_delta_r"] * 100
-)
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
-comparison["v_improvement_percent"] = (
-    comparison["delta_mean_v_difference"] /
-    comparison["gpu_mean_delta_v"] * 100
-)
+from config import DEFAULTS
 
 # =============================
-# BETTER MODEL CLASSIFICATION
+# CONFIG
 # =============================
-def better_model(row):
-    if row["rebound_mean_delta_r"] < row["gpu_mean_delta_r"]:
-        return "Rebound"
-    elif row["rebound_mean_delta_r"] > row["gpu_mean_delta_r"]:
-        return "GPU"
+GPU_SUMMARY = os.path.join("_manual", "ZScore_Summary_XAI.csv")
+REBOUND_SUMMARY = os.path.join("_rebound", "Rebound_vs_Real_Summary.csv")
+OUTPUT_FILE = "model_comparison_summary.csv"
+
+
+def compare_models(zscore_dir=DEFAULTS["zscore_dir"]):
+    """Merge the GPU and Rebound z-score summaries in zscore_dir, save and return the comparison"""
+    gpu_summary_path = os.path.join(zscore_dir, GPU_SUMMARY)
+    rebound_summary_path = os.path.join(zscore_dir, REBOUND_SUMMARY)
+    output_path = os.path.join(zscore_dir, OUTPUT_FILE)
+
+    # =============================
+    # LOAD SUMMARIES
+    # =============================
+    gpu_df = pd.read_csv(gpu_summary_path)
+    rebound_df = pd.read_csv(rebound_summary_path)
+
+    # Rename columns for clarity
+    gpu_df = gpu_df.rename(columns={
+        "max_z_score": "gpu_max_z",
+        "anomaly_count": "gpu_anomaly_count",
+        "stability_class": "gpu_stability_class",
+        "mean_delta_r": "gpu_mean_delta_r",
+        "mean_delta_v": "gpu_mean_delta_v"
+    })
+
+    rebound_df = rebound_df.rename(columns={
+        "max_z_score": "rebound_max_z",
+        "anomaly_count": "rebound_anomaly_count",
+        "stability_class": "rebound_stability_class",
+        "mean_delta_r": "rebound_mean_delta_r",
+        "mean_delta_v": "rebound_mean_delta_v"
+    })
+
+    # =============================
+    # MERGE
+    # =============================
+    comparison = gpu_df.merge(rebound_df, on="object", how="inner")
+
+    # =============================
+    # PERFORMANCE METRICS
+    # =============================
+
+    # Absolute improvement (positive = Rebound better)
+    comparison["delta_mean_r_difference"] = (
+        comparison["gpu_mean_delta_r"] - comparison["rebound_mean_delta_r"]
+    )
+
+    comparison["delta_mean_v_difference"] = (
+        comparison["gpu_mean_delta_v"] - comparison["rebound_mean_delta_v"]
+    )
+
+    # Percentage improvement
+    comparison["r_improvement_percent"] = (
+        comparison["delta_mean_r_difference"] /
+        comparison["gpu_mean_delta_r"] * 100
+    )
+
+    comparison["v_improvement_percent"] = (
+        comparison["delta_mean_v_difference"] /
+        comparison["gpu_mean_delta_v"] * 100
+    )
+
+    # =============================
+    # BETTER MODEL CLASSIFICATION
+    # =============================
+    comparison["better_model_radial"] = np.select(
+        [
+            comparison["rebound_mean_delta_r"] < comparison["gpu_mean_delta_r"],
+            comparison["rebound_mean_delta_r"] > comparison["gpu_mean_delta_r"],
+        ],
+        ["Rebound", "GPU"],
+        default="Equal"
+    )
+
+    # =============================
+    # SAVE RESULT
+    # =============================
+    comparison.to_csv(output_path, index=False)
+
+    print("Model comparison complete.")
+    print(f"Saved to: {output_path}")
+
+    # =============================
+    # QUICK OVERALL STATS
+    # =============================
+    print("\n===== Overall Performance Summary =====")
+
+    avg_gpu_r = comparison["gpu_mean_delta_r"].mean()
+    avg_rebound_r = comparison["rebound_mean_delta_r"].mean()
+
+    print(f"Average GPU radial error:      {avg_gpu_r:.6f} AU")
+    print(f"Average Rebound radial error:  {avg_rebound_r:.6f} AU")
+
+    if avg_rebound_r < avg_gpu_r:
+        print("Overall winner: Rebound")
     else:
-        return "Equal"
-
-comparison["better_model_radial"] = comparison.apply(better_model, axis=1)
-
-# =============================
-# SAVE RESULT
-# =============================
-comparison.to_csv(OUTPUT_PATH, index=False)
-
-print("Model comparison complete.")
-print(f"Saved to: {OUTPUT_PATH}")
+        print("Overall winner: GPU")
 
-# =============================
-# QUICK OVERALL STATS
-# =============================
-print("\n===== Overall Performance Summary =====")
+    return comparison
 
-avg_gpu_r = comparison["gpu_mean_delta_r"].mean()
-avg_rebound_r = comparison["rebound_mean_delta_r"].mean()
 
-print(f"Average GPU radial error:      {avg_gpu_r:.6f} AU")
-print(f"Average Rebound radial error:  {avg_rebound_r:.6f} AU")
+if __name__ == "__main__":
+    from config import load_config
 
-if avg_rebound_r < avg_gpu_r:
-    print("Overall winner: Rebound")
-else:
-    print("Overall winner: GPU")
\ No newline at end of file
+    compare_models(load_config()["zscore_dir"])
@@ -0,0 +1,79 @@
+import numpy as np
+
+# =============================
+# STACKING
+# =============================
+def stack_errors(series_list):
+    """Stack per-object error series into an (objects x epochs) matrix.
+
+    Shorter series are padded with NaN at the end, so every row holds its
+    valid samples at epochs 0..n-1.
+    """
+    width = max((len(s) for s in series_list), default=1)
+    errors = np.full((len(series_list), width), np.nan)
+    for row, s in enumerate(series_list):
+        errors[row, :len(s)] = np.asarray(s, dtype=float)
+    return errors
+
+# =============================
+# METRICS
+# =============================
+def compute_metrics(errors):
+    """RMS, growth ratio, volatility, regression slope and R² for every row at once.
+
+    Matches the per-object definitions used so far: ratio = last / first
+    (1 when the first error is zero), volatility = sample std / mean, and
+    slope / R² from a least-squares fit against the epoch index.
+    """
+    errors = np.atleast_2d(np.asarray(errors, dtype=float))
+    valid = ~np.isnan(errors)
+    padded = not valid.all()
+    n = valid.sum(axis=1)
+    y = np.where(valid, errors, 0.0) if padded else errors
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sum_y = y.sum(axis=1)
+        mean = sum_y / n
+        rms = np.sqrt(np.einsum("ij,ij->i", y, y) / n)
+
+        dev = y - mean[:, None]
+        if padded:
+            dev[~valid] = 0.0
+        var = np.einsum("ij,ij->i", dev, dev)
+        volatility = np.sqrt(var / (n - 1)) / mean
+
+        first = errors[:, 0]
+        last = errors[np.arange(len(errors)), np.maximum(n - 1, 0)]
+        ratio = np.where(first != 0, last / first, 1.0)
+
+        # Closed-form simple linear regression against t = 0..n-1
+        t = np.arange(errors.shape[1], dtype=float)
+        s_tt = n * (n**2 - 1) / 12.0
+        s_ty = dev @ t
+        slope = s_ty / s_tt
+        r_squared = np.where(var > 0, s_ty**2 / (s_tt * var), 0.0)
+
+    return {
+        "rms": rms,
+        "ratio": ratio,
+        "volatility": volatility,
+        "slope": slope,
+        "r_squared": r_squared,
+    }
+
+# =============================
+# BEHAVIOR CLASSIFIER
+# =============================
+def classify(ratio, volatility, r2):
+    """Vectorized behaviour classes; conditions are checked in priority order"""
+    ratio, volatility, r2 = np.broadcast_arrays(ratio, volatility, r2)
+    return np.select(
+        [
+            (ratio < 1.5) & (volatility < 0.5),
+            (ratio < 3) & (r2 > 0.7),
+            volatility > 1.0,
+            ratio >= 3,
+        ],
+        ["Stable", "Linear Drift", "Oscillatory", "Runaway Divergence"],
+        default="Mixed",
+    )
@@ -0,0 +1,123 @@
+"""Cross-run trajectory diff: compare two result sets object by object.
+
+Usage:
+    python analysis/run_diff.py results/rebound results/rebound_whfast
+    python analysis/run_diff.py runA runB --suffix _Rebound.csv --top 20
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import trajstore
+
+# =============================
+# CONFIG
+# =============================
+OUTPUT_DIR = "results/analysis/diff"
+STATE_COLUMNS = ["x", "y", "z", "vx", "vy", "vz"]
+
+# =============================
+# LOADING
+# =============================
+def load_pair(path_a, path_b):
+    """Read two trajectory CSVs (or their stored copies) and keep the epochs present in both"""
+    a = trajstore.read_table(path_a, usecols=["datetime_str"] + STATE_COLUMNS)
+    b = trajstore.read_table(path_b, usecols=["datetime_str"] + STATE_COLUMNS)
+    merged = a.merge(b, on="datetime_str", suffixes=("_a", "_b"))
+    states_a = merged[[f"{c}_a" for c in STATE_COLUMNS]].to_numpy()
+    states_b = merged[[f"{c}_b" for c in STATE_COLUMNS]].to_numpy()
+    return merged["datetime_str"].to_numpy(), states_a, states_b
+
+
+def stack_runs(dir_a, dir_b, suffix):
+    """Stack matching objects of both runs into (objects x epochs x 6) arrays, NaN-padded"""
+    names, epochs, runs_a, runs_b = [], [], [], []
+    for path_a in trajstore.list_tables(dir_a, suffix):
+        fname = os.path.basename(path_a)
+        path_b = os.path.join(dir_b, fname)
+        if not trajstore.exists(path_b):
+            continue
+        dates, sa, sb = load_pair(path_a, path_b)
+        if len(dates) == 0:
+            continue
+        names.append(fname[: -len(suffix)])
+        epochs.append(dates)
+        runs_a.append(sa)
+        runs_b.append(sb)
+
+    width = max((len(d) for d in epochs), default=1)
+    a = np.full((len(names), width, 6), np.nan)
+    b = np.full((len(names), width, 6), np.nan)
+    for k in range(len(names)):
+        a[k, :len(epochs[k])] = runs_a[k]
+        b[k, :len(epochs[k])] = runs_b[k]
+    return names, epochs, a, b
+
+# =============================
+# DIFF ENGINE
+# =============================
+def diff_runs(names, epochs, a, b):
+    """Per-object position/velocity deltas and divergence summary, ranked by max Δr"""
+    delta = b - a
+    dr = np.linalg.norm(delta[..., :3], axis=2)
+    dv = np.linalg.norm(delta[..., 3:], axis=2)
+
+    valid = ~np.isnan(dr)
+    n = valid.sum(axis=1)
+    dr0 = np.where(valid, dr, -np.inf)
+    worst = dr0.argmax(axis=1)
+    rows = np.arange(len(names))
+
+    report = pd.DataFrame({
+        "object": names,
+        "epochs": n,
+        "max_delta_r_AU": dr0[rows, worst],
+        "max_divergence_epoch": [epochs[k][worst[k]] for k in rows],
+        "rms_delta_r_AU": np.sqrt(np.nansum(dr**2, axis=1) / n),
+        "final_delta_r_AU": dr[rows, n - 1],
+        "max_delta_v_AU_per_day": np.nanmax(dv, axis=1),
+        "rms_delta_v_AU_per_day": np.sqrt(np.nansum(dv**2, axis=1) / n),
+    })
+    return report.sort_values("max_delta_r_AU", ascending=False, ignore_index=True)
+
+
+def summarize(report):
+    """Catalog-wide statistics over the per-object report"""
+    cols = ["max_delta_r_AU", "rms_delta_r_AU", "final_delta_r_AU", "max_delta_v_AU_per_day"]
+    return report[cols].describe(percentiles=[0.5, 0.9, 0.99]).T
+
+# =============================
+# MAIN
+# =============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff two trajectory result sets")
+    parser.add_argument("run_a", help="baseline result directory")
+    parser.add_argument("run_b", help="changed result directory")
+    parser.add_argument("--suffix", default="_Rebound.csv", help="trajectory file suffix")
+    parser.add_argument("--top", type=int, default=10, help="most-changed objects to print")
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    names, epochs, a, b = stack_runs(args.run_a, args.run_b, args.suffix)
+    if not names:
+        print("No matching trajectories found. Exiting.")
+        exit(1)
+
+    report = diff_runs(names, epochs, a, b)
+
+    os.makedirs(args.out, exist_ok=True)
+    report.to_csv(os.path.join(args.out, "Run_Diff_Report.csv"), index=False)
+    summarize(report).to_csv(os.path.join(args.out, "Run_Diff_Summary.csv"))
+
+    print(f"Compared {len(names)} objects: {args.run_a} vs {args.run_b}\n")
+    print(summarize(report).to_string())
+    print(f"\nTop {args.top} most-changed objects:")
+    print(report.head(args.top)[["object", "max_delta_r_AU", "max_divergence_epoch", "final_delta_r_AU"]].to_string(index=False))
+    print(f"\nReport saved to: {args.out}")
@@ -9,7 +9,6 @@ import unicodedata
 
 API_BASE = "https://ssd-api.jpl.nasa.gov/sbdb.api"
 OUT_DIR = "data"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 def load_targets(filename="targets.txt"):
     """Load asteroid targets from a text file (one per line, cleans tabs/spaces)"""
@@ -40,8 +39,8 @@ def extract_numeric_id(name):
     match = re.match(r"^\d+", name)
     return match.group(0) if match else None
 
-def fetch_sbdb(target, phys_par=True, full_precision=False, close_approach=False):
-    """Fetch asteroid data from JPL SBDB API"""
+def fetch_sbdb(target, phys_par=True, full_precision=False, close_approach=False, covariance=False):
+    """Fetch asteroid data from JPL SBDB API (covariance=True adds the orbit covariance matrix)"""
     params = {"sstr": target}
     if phys_par:
         params["phys-par"] = 1
@@ -49,6 +48,8 @@ def fetch_sbdb(target, phys_par=True, full_precision=False, close_approach=False
         params["full_prec"] = 1
     if close_approach:
         params["close_approach"] = 1
+    if covariance:
+        params["cov"] = "mat"
 
     resp = requests.get(API_BASE, params=params, timeout=20)
     resp.raise_for_status()
@@ -66,10 +67,14 @@ def fetch_sbdb(target, phys_par=True, full_precision=False, close_approach=False
 
     return data
 
-def summarize_and_save(target, data):
+def safe_filename(target):
+    """File stem used for a target's JSON (e.g. '622467 Ignés' → '622467_Ignes')"""
+    return re.sub(r"[^\w\-]+", "_", normalize_name(target).strip())
+
+def summarize_and_save(target, data, out_dir=OUT_DIR):
     """Save JSON safely and print summary"""
-    safe_target = re.sub(r"[^\w\-]+", "_", normalize_name(target).strip())
-    fname = os.path.join(OUT_DIR, f"{safe_target}.json")
+    os.makedirs(out_dir, exist_ok=True)
+    fname = os.path.join(out_dir, f"{safe_filename(target)}.json")
 
     with open(fname, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
@@ -95,20 +100,16 @@ def summarize_and_save(target, data):
     print(f"Diameter: {diam if diam else 'N/A'}")
     print(f"Saved raw JSON to: {fname}\n")
 
-if __name__ == "__main__":
-    targets = load_targets("targets.txt")
-    if not targets:
-        print("No targets loaded. Exiting.")
-        exit(1)
-
+def fetch_all(targets, out_dir=OUT_DIR):
+    """Fetch every target not already present in out_dir; returns (success, errors)"""
+    os.makedirs(out_dir, exist_ok=True)
     print(f"\nStarting to fetch {len(targets)} asteroids...\n")
     success_count = 0
     error_count = 0
 
     for i, t in enumerate(targets, 1):
         safe_t = normalize_name(t)
-        safe_filename = re.sub(r"[^\w\-]+", "_", safe_t.strip())
-        fname = os.path.join(OUT_DIR, f"{safe_filename}.json")
+        fname = os.path.join(out_dir, f"{safe_filename(t)}.json")
 
         if os.path.exists(fname):
             print(f"[{i}/{len(targets)}] Skipping {t} (already downloaded)")
@@ -119,7 +120,7 @@ if __name__ == "__main__":
         try:
             print(f"[{i}/{len(targets)}] Fetching {t} (query: {query_name})...")
             data = fetch_sbdb(query_name)
-            summarize_and_save(t, data)
+            summarize_and_save(t, data, out_dir)
             success_count += 1
             time.sleep(0.2)
         except Exception as exc:
@@ -132,3 +133,12 @@ if __name__ == "__main__":
     print(f"Successfully fetched: {success_count}")
     print(f"Errors: {error_count}")
     print(f"{'='*50}")
+    return success_count, error_count
+
+if __name__ == "__main__":
+    targets = load_targets("targets.txt")
+    if not targets:
+        print("No targets loaded. Exiting.")
+        exit(1)
+
+    fetch_all(targets)
@@ -0,0 +1,167 @@
+"""MEGNO and Lyapunov times for the whole catalog from one variational integration.
+
+Every asteroid is a test particle in the Sun + planets simulation, and each
+gets its own first-order variational particle (add_variation(testparticle=k)):
+one extra particle per object, instead of a separate simulation with a full
+variational set per object. REBOUND's built-in MEGNO only tracks the first variational set, so
+the indicators are accumulated here from |delta| sampled every sample_days:
+
+    Y(t)   = 2 ln|delta(t)| - (2/t) * integral_0^t ln|delta| ds   (MEGNO)
+    <Y>(t) = (1/t) * integral_0^t Y ds                            (mean MEGNO)
+    lambda = least-squares slope of <Y>(t)                        (as sim.lyapunov())
+
+Only running sums are kept, so memory is O(objects). <Y> -> 2 for regular
+orbits and grows ~ lambda*t for chaotic ones. REBOUND supports test-particle
+variations only with IAS15.
+
+All objects share IAS15's adaptive step, so an object's values depend
+slightly on the rest of the batch (relative differences around 1e-5 for
+regular orbits). Reruns of the same target list give identical results.
+
+Usage:
+    python src/chaos.py --years 100 --limit 0
+    python src/cli.py chaos --years 100
+"""
+
+import os
+import zlib
+import argparse
+import numpy as np
+
+from elements import add_states
+from epochs import aligned_catalog
+from solar_system import planet_simulation
+
+CHAOS_FILE = "Chaos_Indicators.csv"
+CHAOS_COLUMNS = ["megno", "lyapunov_per_day", "lyapunov_time_yr", "dynamics"]
+
+DEFAULT_YEARS = 100
+DEFAULT_SAMPLE_DAYS = 5
+MEGNO_CHAOTIC = 2.5     # <Y> above this is flagged chaotic
+RESCALE = 1e30          # renormalize delta before it can overflow
+
+
+def _get_deltas(variations):
+    """(K x 6) array of the deviation vectors x..vz, one per variation"""
+    return np.array([[*p.xyz, *p.vxyz] for p in (var.particles[0] for var in variations)])
+
+
+def _set_delta(var, delta):
+    p = var.particles[0]
+    p.xyz, p.vxyz = delta[:3], delta[3:]
+
+
+def chaos_indicators(names, data_dir="data", years=DEFAULT_YEARS, sample_days=DEFAULT_SAMPLE_DAYS, seed=None,
+                     cache_dir=None):
+    """DataFrame with MEGNO, Lyapunov exponent (1/day) and Lyapunov time (yr) per object"""
+    import pandas as pd
+
+    found, _, states = aligned_catalog(names, data_dir, cache_dir=cache_dir)
+    if not found:
+        raise ValueError("No objects with element files found")
+
+    sim = planet_simulation()
+    first = add_states(sim, states)
+    sim.move_to_com()
+    sim.integrator = "ias15"
+    variations = [sim.add_variation(testparticle=first + k) for k in range(len(found))]
+
+    # Initial deviation seeded per object, so reruns of the same target list are reproducible
+    for var, name in zip(variations, found):
+        delta = np.random.default_rng([seed or 0, zlib.crc32(name.encode())]).normal(size=6)
+        _set_delta(var, delta / np.linalg.norm(delta))
+
+    times = np.arange(sample_days, years * 365.25 + sample_days / 2, sample_days)
+    n = len(found)
+    log_offset = np.zeros(n)    # ln of the factors divided out by renormalization
+    ln_prev = np.zeros(n)
+    int_ln = np.zeros(n)        # integral of ln|delta|
+    int_y = np.zeros(n)         # integral of Y
+    y_prev = np.zeros(n)
+    s_t = s_tt = 0.0
+    s_y = np.zeros(n)
+    s_ty = np.zeros(n)
+    t_prev = 0.0
+
+    print(f"[INFO] Variational run: {n} objects, {years} yr, IAS15, {len(times)} samples")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for t in times:
+            sim.integrate(t, exact_finish_time=0)
+            t = sim.t
+            deltas = _get_deltas(variations)
+            norm = np.linalg.norm(deltas, axis=1)
+            ln_delta = np.log(norm) + log_offset
+
+            for k in np.flatnonzero(norm > RESCALE):
+                _set_delta(variations[k], deltas[k] / norm[k])
+                log_offset[k] += np.log(norm[k])
+
+            dt = t - t_prev
+            int_ln += 0.5 * (ln_delta + ln_prev) * dt
+            y = 2.0 * (ln_delta - int_ln / t)
+            int_y += 0.5 * (y + y_prev) * dt
+            mean_y = int_y / t
+
+            s_t += t
+            s_tt += t * t
+            s_y += mean_y
+            s_ty += t * mean_y
+            ln_prev, y_prev, t_prev = ln_delta, y, t
+
+    m = len(times)
+    lyapunov = (m * s_ty - s_t * s_y) / (m * s_tt - s_t ** 2)
+    megno = int_y / t_prev
+    chaotic = megno > MEGNO_CHAOTIC
+
+    return pd.DataFrame({
+        "object": found,
+        "megno": megno,
+        "lyapunov_per_day": lyapunov,
+        "lyapunov_time_yr": np.where(chaotic & (lyapunov > 0), 1.0 / (lyapunov * 365.25), np.inf),
+        "dynamics": np.where(np.isnan(megno), "Unknown", np.where(chaotic, "Chaotic", "Regular")),
+    })
+
+
+def add_to_summary(chaos, summary_path):
+    """Merge the chaos columns into an existing unified summary (replacing older ones)"""
+    import pandas as pd
+
+    if not os.path.exists(summary_path):
+        return None
+    summary = pd.read_csv(summary_path)
+    summary = summary.drop(columns=[c for c in CHAOS_COLUMNS if c in summary.columns])
+    summary = summary.merge(chaos, on="object", how="left")
+    summary.to_csv(summary_path, index=False)
+    print(f"[INFO] Chaos indicators added to {summary_path}")
+    return summary
+
+
+def run(names, data_dir="data", output_dir=os.path.join("results", "analysis", "unified"),
+        years=DEFAULT_YEARS, sample_days=DEFAULT_SAMPLE_DAYS, seed=None,
+        summary_file="Unified_Model_Comparison_Advanced.csv", cache_dir=None):
+    os.makedirs(output_dir, exist_ok=True)
+    chaos = chaos_indicators(names, data_dir, years, sample_days, seed, cache_dir)
+
+    out = os.path.join(output_dir, CHAOS_FILE)
+    chaos.to_csv(out, index=False)
+    counts = ", ".join(f"{c}: {k}" for c, k in chaos["dynamics"].value_counts().items())
+    print(f"Chaos indicators saved to: {out} ({counts})")
+
+    add_to_summary(chaos, os.path.join(output_dir, summary_file))
+    return chaos
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=100, help="first N targets (0 = all)")
+    parser.add_argument("--years", type=float, default=DEFAULT_YEARS)
+    parser.add_argument("--sample-days", type=float, default=DEFAULT_SAMPLE_DAYS)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    run(read_targets(args.targets, args.limit), args.data_dir, years=args.years,
+        sample_days=args.sample_days, seed=args.seed)
@@ -0,0 +1,201 @@
+"""Checkpointed long integrations backed by a REBOUND Simulationarchive.
+
+All catalog objects run as test particles in one Sun + planets simulation.
+REBOUND appends a snapshot to <run_dir>/archive.bin every `interval` days and
+manifest.json records the run setup and progress. Re-running the same command
+resumes from the last snapshot. The state at any time is rebuilt by seeking
+the nearest earlier snapshot and integrating forward, so no dense 5-day
+samples have to be stored even for 100+ year runs.
+
+Usage:
+    python src/checkpoint.py run results/archive/catalog_100yr --years 100
+    python src/checkpoint.py state results/archive/catalog_100yr --t 18262.5
+"""
+
+import os
+import json
+import argparse
+import warnings
+import numpy as np
+from datetime import datetime
+
+from elements import add_states
+from epochs import aligned_catalog
+from integrators import PROFILES, configure
+from solar_system import planet_simulation
+
+ARCHIVE_FILE = "archive.bin"
+MANIFEST_FILE = "manifest.json"
+
+DEFAULT_INTERVAL = 365.25   # days between snapshots
+DEFAULT_PROFILE = "whfast"
+
+
+# -------------------- Manifest --------------------
+def read_manifest(run_dir):
+    with open(os.path.join(run_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(run_dir, manifest):
+    """Write via a temp file so an interrupted write never corrupts the manifest"""
+    path = os.path.join(run_dir, MANIFEST_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+# -------------------- Run / resume --------------------
+def run_archived(run_dir, names=None, data_dir="data", t_end=None,
+                 interval=DEFAULT_INTERVAL, profile=DEFAULT_PROFILE, cache_dir=None):
+    """Integrate the catalog to t_end (days), writing snapshots; resumes if run_dir has an archive.
+
+    For a new run, names/data_dir pick the objects. For a resumed run the
+    manifest is authoritative and only t_end may be extended. A manifest
+    without an archive (e.g. a run killed before its first snapshot) is
+    restarted from t = 0 with the manifest's objects, profile, interval and
+    t_end. cache_dir is the optional epoch-alignment cache (see epochs.align).
+    """
+    import rebound
+
+    archive_path = os.path.join(run_dir, ARCHIVE_FILE)
+    has_manifest = os.path.exists(os.path.join(run_dir, MANIFEST_FILE))
+
+    if has_manifest and not os.path.exists(archive_path):
+        old = read_manifest(run_dir)
+        print(f"[WARNING] {run_dir} has a manifest but no {ARCHIVE_FILE}; restarting the run from its manifest")
+        names, profile, interval = old["objects"], old["profile"], old["interval"]
+        t_end = old["t_end"] if t_end is None else max(old["t_end"], t_end)
+        has_manifest = False
+
+    if has_manifest:
+        manifest = read_manifest(run_dir)
+        if t_end is not None:
+            manifest["t_end"] = max(manifest["t_end"], t_end)
+        sim = rebound.Simulation(archive_path)
+        configure(sim, manifest["profile"])
+        print(f"[INFO] Resuming {run_dir} from t = {sim.t:.1f} d")
+    else:
+        if profile not in PROFILES or PROFILES[profile]["integrator"] is None:
+            raise ValueError(f"Profile '{profile}' cannot be archived")
+        if t_end is None:
+            raise ValueError("t_end is required for a new run")
+        if names is None:
+            raise ValueError("names are required for a new run")
+        os.makedirs(run_dir, exist_ok=True)
+
+        found, _, states = aligned_catalog(names, data_dir, cache_dir=cache_dir)
+        if not found:
+            raise ValueError("No objects with element files found")
+
+        sim = planet_simulation()
+        first = add_states(sim, states)
+        sim.move_to_com()
+        configure(sim, profile)
+
+        manifest = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "start_date": "2025-01-01",
+            "profile": profile,
+            "interval": interval,
+            "t_end": t_end,
+            "first_asteroid": first,
+            "objects": found,
+            "last_snapshot_t": 0.0,
+            "complete": False,
+        }
+        print(f"[INFO] New run {run_dir}: {len(found)} objects, {t_end:.1f} d")
+
+    with warnings.catch_warnings():
+        # Appending to an existing archive is exactly what resuming means
+        warnings.simplefilter("ignore", RuntimeWarning)
+        sim.save_to_file(archive_path, interval=manifest["interval"])
+
+    manifest["complete"] = False
+    write_manifest(run_dir, manifest)
+
+    # Integrate snapshot by snapshot so the manifest tracks progress
+    t = sim.t
+    while t < manifest["t_end"]:
+        t = min(t + manifest["interval"], manifest["t_end"])
+        sim.integrate(t)
+        manifest["last_snapshot_t"] = sim.t
+        write_manifest(run_dir, manifest)
+
+    manifest["complete"] = True
+    write_manifest(run_dir, manifest)
+    print(f"[INFO] Run complete at t = {sim.t:.1f} d")
+    return manifest
+
+
+# -------------------- Random-time access --------------------
+def state_at(run_dir, t):
+    """Heliocentric (objects x 6) states at time t, from the nearest earlier snapshot"""
+    import rebound
+
+    manifest = read_manifest(run_dir)
+    archive = rebound.Simulationarchive(os.path.join(run_dir, ARCHIVE_FILE))
+    if t > archive.tmax:
+        raise ValueError(f"t = {t} is beyond the last snapshot ({archive.tmax})")
+
+    sim = archive.getSimulation(t, mode="exact")
+    return _heliocentric(sim, manifest["first_asteroid"])
+
+
+def sample(run_dir, times):
+    """Yield (t, states) for increasing times, integrating forward between requests
+    and only re-seeking the archive when the next time is past the following snapshot"""
+    import rebound
+
+    manifest = read_manifest(run_dir)
+    archive = rebound.Simulationarchive(os.path.join(run_dir, ARCHIVE_FILE))
+    sim = None
+
+    for t in sorted(times):
+        if sim is None or t - sim.t > manifest["interval"]:
+            sim = archive.getSimulation(t, mode="snapshot")
+        sim.integrate(t)
+        yield t, _heliocentric(sim, manifest["first_asteroid"])
+
+
+def _heliocentric(sim, first):
+    xyz = np.zeros((sim.N, 3), dtype="float64")
+    vxvyvz = np.zeros((sim.N, 3), dtype="float64")
+    sim.serialize_particle_data(xyz=xyz, vxvyvz=vxvyvz)
+    return np.hstack([xyz[first:] - xyz[0], vxvyvz[first:] - vxvyvz[0]])
+
+
+# -------------------- Main --------------------
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="start or resume an archived run")
+    p.add_argument("run_dir")
+    p.add_argument("--targets", default="targets_english.txt")
+    p.add_argument("--data-dir", default="data")
+    p.add_argument("--limit", type=int, default=100)
+    p.add_argument("--years", type=float, default=None)
+    p.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="days between snapshots")
+    p.add_argument("--profile", default=DEFAULT_PROFILE)
+
+    p = sub.add_parser("state", help="print states at time t (days since start)")
+    p.add_argument("run_dir")
+    p.add_argument("--t", type=float, required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        t_end = args.years * 365.25 if args.years else None
+        names = None
+        if not os.path.exists(os.path.join(args.run_dir, MANIFEST_FILE)):
+            names = read_targets(args.targets, args.limit)
+        run_archived(args.run_dir, names, args.data_dir, t_end, args.interval, args.profile)
+    else:
+        manifest = read_manifest(args.run_dir)
+        states = state_at(args.run_dir, args.t)
+        for name, s in zip(manifest["objects"], states):
+            print(f"{name:<25} " + " ".join(f"{v: .9e}" for v in s))
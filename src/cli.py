@@ -0,0 +1,487 @@
+"""Single command-line entry point for the asteroid pipeline.
+
+Heavy dependencies (rebound, pandas, scipy, matplotlib, astroquery) are only
+imported inside the subcommand that needs them, so quick commands start fast.
+Paths come from config.py (override with --config or rnd_config.json).
+
+Usage:
+    python src/cli.py validate [--catalog-only]
+    python src/cli.py fetch [--source horizons]
+    python src/cli.py ingest
+    python src/cli.py families --cutoff 70 --neighbours "433 Eros"
+    python src/cli.py simulate [--profile whfast]
+    python src/cli.py profiles
+    python src/cli.py propagate "99942 Apophis" --clones 2000
+    python src/cli.py archive results/archive/run100 --years 100
+    python src/cli.py stream --batch-size 256
+    python src/cli.py compare [--models]
+    python src/cli.py chaos --years 100
+    python src/cli.py events --years 20 --encounter-au 0.05
+    python src/cli.py ephem --date 2025-03-01 --max-mag 18
+    python src/cli.py kepler
+    python src/cli.py align --date 2025-01-01
+    python src/cli.py simulate --shard 0/4 --queue /mnt/shared/queue
+    python src/cli.py merge
+    python src/cli.py pack results/rebound --tolerance-km 1 --remove-csv
+    python src/cli.py index
+    python src/cli.py find "orbit_class = 'Apollo' AND rebound_rms_error > 1e-3"
+    python src/cli.py plot
+    python src/cli.py query "433 Eros"
+"""
+
+import os
+import sys
+import argparse
+
+from config import load_config
+
+ANALYSIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "analysis")
+
+# Subcommands whose outputs are indexed; an existing result index is refreshed after them
+WRITES_RESULTS = {"fetch", "ingest", "families", "simulate", "propagate", "stream", "compare",
+                  "chaos", "events", "merge", "pack", "unpack"}
+
+
+def _use_analysis():
+    """Make analysis/ modules importable"""
+    if ANALYSIS_DIR not in sys.path:
+        sys.path.insert(0, ANALYSIS_DIR)
+
+
+def _sharded(args):
+    return args.shard is not None or args.queue is not None
+
+
+def _shard(args):
+    from shard import parse_shard
+    return parse_shard(args.shard) if args.shard else None
+
+
+# -------------------- Subcommands --------------------
+def cmd_validate(args, cfg):
+    from validate_targets import run
+    report_file = os.path.join(cfg["analysis_dir"], "Target_Validation_Report.csv")
+    clean, _ = run(cfg["targets_file"], cfg["catalog_file"], args.out, report_file, args.catalog_only)
+    return 0 if clean else 1
+
+
+def cmd_families(args, cfg):
+    from families import label_catalog, print_neighbours
+    index, rows, _ = label_catalog(cfg["catalog_file"], args.cutoff, args.min_members, args.metric)
+    for name in args.neighbours:
+        print_neighbours(index, rows, name, args.cutoff)
+    return 0
+
+
+def cmd_fetch(args, cfg):
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    if args.source == "horizons":
+        if _sharded(args):
+            print("[ERROR] --shard/--queue are only supported for --source sbdb")
+            return 1
+        from real import fetch_real
+        fetch_real(cfg["targets_file"], cfg["real_dir"], limit=limit, plot=False)
+        return 0
+
+    from api_Test import load_targets, fetch_all
+    targets = load_targets(cfg["targets_file"])
+    if not targets:
+        print("No targets loaded. Exiting.")
+        return 1
+    targets = targets[:limit] if limit else targets
+    if _sharded(args):
+        from shard import fetch_shard
+        fetch_shard(targets, cfg["data_dir"], _shard(args), args.queue, args.worker)
+        return 0
+    fetch_all(targets, cfg["data_dir"])
+    return 0
+
+
+def cmd_ingest(args, cfg):
+    from ingest import build_master
+    build_master(args.folder or cfg["sbdb_dir"], cfg["catalog_file"])
+    return 0
+
+
+def cmd_simulate(args, cfg):
+    from rebound_check import run
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    profile = args.profile or cfg["integrator_profile"]
+    if _sharded(args):
+        from rebound_check import read_targets
+        from shard import simulate_shard
+        simulate_shard(read_targets(cfg["targets_file"], limit), cfg["data_dir"], cfg["rebound_dir"], profile,
+                       _shard(args), args.queue, args.worker)
+        return 0
+    run(cfg["targets_file"], cfg["data_dir"], cfg["rebound_dir"], limit=limit, profile=profile)
+    return 0
+
+
+def cmd_profiles(args, cfg):
+    from rebound_check import read_targets, times, start_date
+    from integrators import profile_report
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    targets = read_targets(cfg["targets_file"], limit)
+    report = profile_report(targets, cfg["data_dir"], cfg["real_dir"], times, start_date, args.profiles)
+
+    os.makedirs(cfg["analysis_dir"], exist_ok=True)
+    out = os.path.join(cfg["analysis_dir"], "Integrator_Profile_Report.csv")
+    report.to_csv(out, index=False)
+    print(report.to_string(index=False))
+    print(f"\nSaved to: {out}")
+    return 0
+
+
+def cmd_propagate(args, cfg):
+    from clones import run
+    results = run(args.targets, args.clones, args.seed, cfg["data_dir"], cfg["clones_dir"])
+    return 0 if results else 1
+
+
+def cmd_archive(args, cfg):
+    import checkpoint
+    if args.at is not None:
+        manifest = checkpoint.read_manifest(args.run_dir)
+        states = checkpoint.state_at(args.run_dir, args.at)
+        for name, s in zip(manifest["objects"], states):
+            print(f"{name:<25} " + " ".join(f"{v: .9e}" for v in s))
+        return 0
+
+    from rebound_check import read_targets
+    names = None
+    if not os.path.exists(os.path.join(args.run_dir, checkpoint.MANIFEST_FILE)):
+        limit = args.limit if args.limit is not None else cfg["target_limit"]
+        names = read_targets(cfg["targets_file"], limit)
+    t_end = args.years * 365.25 if args.years else None
+    checkpoint.run_archived(args.run_dir, names, cfg["data_dir"], t_end, args.interval, args.profile,
+                            cfg["epoch_cache_dir"])
+    return 0
+
+
+def cmd_stream(args, cfg):
+    from rebound_check import read_targets
+    from stream import run_pipeline
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    output_path = os.path.join(cfg["analysis_dir"], "Stream_Summary.csv")
+    run_pipeline(read_targets(cfg["targets_file"], limit), args.source, cfg["data_dir"], cfg["real_dir"],
+                 output_path, batch_size=args.batch_size or cfg["batch_size"], queue_size=args.queue_size)
+    return 0
+
+
+def cmd_compare(args, cfg):
+    _use_analysis()
+    if args.models:
+        from comparision import compare_models
+        compare_models(cfg["zscore_dir"])
+        return 0
+    if _sharded(args):
+        from rebound_check import read_targets
+        from shard import compare_shard
+        limit = args.limit if args.limit is not None else cfg["target_limit"]
+        compare_shard(read_targets(cfg["targets_file"], limit), cfg["real_dir"], cfg["rebound_dir"],
+                      cfg["manual_dir"], cfg["analysis_dir"], shard=_shard(args), queue_dir=args.queue,
+                      worker=args.worker)
+        return 0
+    from _rebound import run
+    run(cfg["real_dir"], cfg["rebound_dir"], cfg["manual_dir"], cfg["analysis_dir"])
+    return 0
+
+
+def cmd_chaos(args, cfg):
+    from rebound_check import read_targets
+    from chaos import run
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    run(read_targets(cfg["targets_file"], limit), cfg["data_dir"], cfg["analysis_dir"],
+        years=args.years, sample_days=args.sample_days, seed=args.seed, cache_dir=cfg["epoch_cache_dir"])
+    return 0
+
+
+def cmd_events(args, cfg):
+    from rebound_check import read_targets
+    from events import run
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    run(read_targets(cfg["targets_file"], limit), cfg["data_dir"], cfg["analysis_dir"], years=args.years,
+        profile=args.profile, encounter_au=args.encounter_au, r_au=args.r_au,
+        cache_dir=cfg["epoch_cache_dir"])
+    return 0
+
+
+def cmd_ephem(args, cfg):
+    import numpy as np
+    from rebound_check import read_targets
+    from ephemeris import visibility, ephemeris, jd_from_date
+    limit = args.limit if args.limit is not None else 0
+    targets = read_targets(cfg["targets_file"], limit)
+    os.makedirs(cfg["analysis_dir"], exist_ok=True)
+
+    if args.days:
+        jd = jd_from_date(args.date) + np.arange(0, args.days, args.step)
+        table = ephemeris(targets, jd, cfg["data_dir"])
+        out = os.path.join(cfg["analysis_dir"], f"Ephemeris_{args.date}_{args.days:g}d.csv")
+    else:
+        table = visibility(targets, args.date, cfg["data_dir"], args.min_elongation, args.max_mag, args.lat)
+        print(table.to_string(index=False))
+        out = os.path.join(cfg["analysis_dir"], f"Visibility_{args.date}.csv")
+
+    table.to_csv(out, index=False)
+    print(f"\n{len(table)} rows saved to: {out}")
+    return 0
+
+
+def cmd_kepler(args, cfg):
+    from rebound_check import read_targets
+    from kepler import run
+    limit = args.limit if args.limit is not None else cfg["target_limit"]
+    run(read_targets(cfg["targets_file"], limit), cfg["data_dir"], cfg["analysis_dir"])
+    return 0
+
+
+def cmd_align(args, cfg):
+    from rebound_check import read_targets
+    from epochs import run
+    limit = args.limit if args.limit is not None else 0
+    run(read_targets(cfg["targets_file"], limit), cfg["data_dir"], args.date, cfg["analysis_dir"],
+        cache_dir=None if args.no_cache else cfg["epoch_cache_dir"])
+    return 0
+
+
+def cmd_merge(args, cfg):
+    from shard import merge_summaries
+    merged = merge_summaries(cfg["analysis_dir"], cleanup=args.cleanup)
+    return 0 if merged is not None else 1
+
+
+def cmd_pack(args, cfg):
+    from trajstore import pack_dir
+    tolerance = args.tolerance_km if args.tolerance_km is not None else cfg["store_tolerance_km"]
+    report = pack_dir(args.directory, tolerance, remove_csv=args.remove_csv)
+    if not len(report):
+        print(f"No CSV files in {args.directory}")
+        return 1
+
+    os.makedirs(cfg["analysis_dir"], exist_ok=True)
+    name = os.path.basename(os.path.normpath(args.directory))
+    out = os.path.join(cfg["analysis_dir"], f"{name}_Store_Report.csv")
+    report.to_csv(out, index=False)
+    print(f"Per-object error bounds saved to: {out}")
+    return 0
+
+
+def cmd_unpack(args, cfg):
+    from trajstore import unpack_dir
+    return 0 if unpack_dir(args.directory, args.out) else 1
+
+
+def _update_index(cfg, rebuild=False):
+    from result_index import update_index
+    return update_index(cfg["index_file"], cfg["catalog_file"], cfg, rebuild=rebuild)
+
+
+def cmd_index(args, cfg):
+    _update_index(cfg, rebuild=args.rebuild)
+    return 0
+
+
+def cmd_find(args, cfg):
+    from result_index import query
+    if not os.path.exists(cfg["index_file"]):
+        _update_index(cfg)
+    columns = args.columns.split(",") if args.columns else None
+    table = query(cfg["index_file"], args.where, columns, args.order_by, args.limit, args.sql)
+    print(table.to_string(index=False))
+    print(f"\n{len(table)} rows")
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"Saved to: {args.out}")
+    return 0
+
+
+def cmd_plot(args, cfg):
+    _use_analysis()
+    from plot import make_plots
+    summary_file = os.path.join(cfg["analysis_dir"], "Unified_Model_Comparison_Advanced.csv")
+    make_plots(summary_file, cfg["plot_dir"])
+    return 0
+
+
+def cmd_query(args, cfg):
+    from api_Test import fetch_sbdb, extract_numeric_id, normalize_name, summarize_and_save
+    query_name = extract_numeric_id(args.target) or normalize_name(args.target)
+    data = fetch_sbdb(query_name, full_precision=args.full_prec, covariance=args.cov)
+
+    if args.save:
+        summarize_and_save(args.target, data, cfg["data_dir"])
+        return 0
+
+    obj = data.get("object", {})
+    orbit = data.get("orbit", {})
+    print(f"Name: {obj.get('fullname', args.target)}")
+    print(f"Class: {obj.get('orbit_class', {}).get('name', 'N/A')}")
+    print(f"Epoch: {orbit.get('epoch', 'N/A')}")
+    for el in orbit.get("elements", []):
+        sigma = f" ± {el['sigma']}" if el.get("sigma") else ""
+        print(f"  {el['name']:<4} {el['value']}{sigma} {el.get('units') or ''}")
+    return 0
+
+
+# -------------------- Parser --------------------
+def _add_shard_args(p):
+    p.add_argument("--shard", default=None, help="k/N: only process shard k of N (0-based)")
+    p.add_argument("--queue", default=None, help="shared queue directory; claim work with lease files")
+    p.add_argument("--worker", default=None, help="worker id for leases and summary parts (default: host-pid)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Asteroid orbit pipeline")
+    parser.add_argument("--config", default=None, help="JSON file overriding config.DEFAULTS")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("validate", help="deduplicate the target list and check it against the catalog")
+    p.add_argument("--out", default=None, help="clean list (default: <targets>_clean.txt)")
+    p.add_argument("--catalog-only", action="store_true", help="drop targets with no catalog row")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("fetch", help="download SBDB elements (or Horizons vectors) for the targets")
+    p.add_argument("--source", choices=["sbdb", "horizons"], default="sbdb")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    _add_shard_args(p)
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("ingest", help="combine SBDB JSON files into the master catalog")
+    p.add_argument("--folder", default=None, help="SBDB JSON folder (default: config sbdb_dir)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("families", help="label dynamical families in the catalog (KD-tree + HCM)")
+    p.add_argument("--metric", choices=["zappala", "euclidean"], default="zappala")
+    p.add_argument("--cutoff", type=float, default=70.0, help="linking distance (m/s for zappala)")
+    p.add_argument("--min-members", type=int, default=5)
+    p.add_argument("--neighbours", nargs="*", default=[], help="list neighbours of these objects")
+    p.set_defaults(func=cmd_families)
+
+    p = sub.add_parser("simulate", help="run REBOUND simulations for the targets")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--profile", default=None, help="integrator profile or 'auto' (see integrators.py)")
+    _add_shard_args(p)
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("profiles", help="wall time vs RMS error against results/real per integrator profile")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--profiles", nargs="+", default=None, help="profiles to compare (default: all)")
+    p.set_defaults(func=cmd_profiles)
+
+    p = sub.add_parser("propagate", help="Monte Carlo clone propagation from orbit uncertainties")
+    p.add_argument("targets", nargs="+")
+    p.add_argument("--clones", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=cmd_propagate)
+
+    p = sub.add_parser("archive", help="checkpointed long run (start or resume), or states at --at T")
+    p.add_argument("run_dir")
+    p.add_argument("--years", type=float, default=None, help="run length (extends a resumed run)")
+    p.add_argument("--interval", type=float, default=365.25, help="days between snapshots")
+    p.add_argument("--profile", default="whfast")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--at", type=float, default=None, help="print states at this time (days)")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("stream", help="fetch -> propagate -> compare -> summarise without intermediate files")
+    p.add_argument("--source", choices=["local", "sbdb"], default="local")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--batch-size", type=int, default=None)
+    p.add_argument("--queue-size", type=int, default=4, help="batches buffered between stages")
+    p.set_defaults(func=cmd_stream)
+
+    p = sub.add_parser("compare", help="three-way comparison against Horizons")
+    p.add_argument("--models", action="store_true", help="GPU vs Rebound comparison of the z-score summaries instead")
+    p.add_argument("--limit", type=int, default=None, help="first N targets when sharding (0 = all)")
+    _add_shard_args(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("chaos", help="MEGNO / Lyapunov time for all targets in one variational integration")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--years", type=float, default=100)
+    p.add_argument("--sample-days", type=float, default=5, help="spacing of the |delta| samples")
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=cmd_chaos)
+
+    p = sub.add_parser("events", help="planet encounters, perihelia and r crossings found while integrating")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.add_argument("--years", type=float, default=20)
+    p.add_argument("--profile", default="ias15", help="REBOUND integrator profile")
+    p.add_argument("--encounter-au", type=float, default=0.05, help="planet distance that counts as an encounter")
+    p.add_argument("--r-au", type=float, nargs="*", default=[1.0, 1.3], help="heliocentric distances to log crossings of")
+    p.set_defaults(func=cmd_events)
+
+    p = sub.add_parser("ephem", help="nightly visibility list (or --days table) of RA/Dec, elongation, phase, V")
+    p.add_argument("--date", required=True, help="YYYY-MM-DD (0h)")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (default: all)")
+    p.add_argument("--min-elongation", type=float, default=60.0)
+    p.add_argument("--max-mag", type=float, default=21.0)
+    p.add_argument("--lat", type=float, default=None, help="observer latitude (deg) for Dec limits")
+    p.add_argument("--days", type=float, default=None, help="write a full table over this many days instead")
+    p.add_argument("--step", type=float, default=1.0, help="table step (days)")
+    p.set_defaults(func=cmd_ephem)
+
+    p = sub.add_parser("kepler", help="Kepler solver iteration counts per object for each starter / method")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (0 = all)")
+    p.set_defaults(func=cmd_kepler)
+
+    p = sub.add_parser("align", help="advance every catalog orbit from its own epoch to one common epoch")
+    p.add_argument("--date", default="2025-01-01", help="common epoch, YYYY-MM-DD (0h)")
+    p.add_argument("--limit", type=int, default=None, help="first N targets (default: all)")
+    p.add_argument("--no-cache", action="store_true", help="ignore the configured epoch_cache_dir")
+    p.set_defaults(func=cmd_align)
+
+    p = sub.add_parser("merge", help="join per-shard comparison summaries into the unified summary")
+    p.add_argument("--cleanup", action="store_true", help="delete the part files after merging")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("pack", help="compress a results directory into its trajectory store")
+    p.add_argument("directory")
+    p.add_argument("--tolerance-km", type=float, default=None,
+                   help="quantize states to this position error (default: config store_tolerance_km; none = lossless)")
+    p.add_argument("--remove-csv", action="store_true", help="delete the CSVs once stored")
+    p.set_defaults(func=cmd_pack)
+
+    p = sub.add_parser("unpack", help="write a trajectory store back out as CSV")
+    p.add_argument("directory")
+    p.add_argument("--out", default=None, help="output directory (default: the same directory)")
+    p.set_defaults(func=cmd_unpack)
+
+    p = sub.add_parser("index", help="refresh the SQLite index of catalog, summaries and trajectory files")
+    p.add_argument("--rebuild", action="store_true", help="re-read every source")
+    p.set_defaults(func=cmd_index)
+
+    p = sub.add_parser("find", help="query the result index (SQL condition on the objects table)")
+    p.add_argument("where", nargs="?", default=None, help="e.g. \"orbit_class = 'Apollo' AND rebound_rms_error > 1e-3\"")
+    p.add_argument("--columns", default=None, help="comma-separated columns (default: all)")
+    p.add_argument("--order-by", default=None)
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--sql", default=None, help="run a full SQL query instead (tables: objects, catalog, summary, events, paths)")
+    p.add_argument("--out", default=None, help="also save the rows as CSV")
+    p.set_defaults(func=cmd_find)
+
+    p = sub.add_parser("plot", help="plots from the unified summary")
+    p.set_defaults(func=cmd_plot)
+
+    p = sub.add_parser("query", help="look up one object in SBDB")
+    p.add_argument("target")
+    p.add_argument("--full-prec", action="store_true")
+    p.add_argument("--cov", action="store_true", help="include the covariance matrix")
+    p.add_argument("--save", action="store_true", help="save the JSON into data_dir")
+    p.set_defaults(func=cmd_query)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cfg = load_config(args.config)
+    status = args.func(args, cfg)
+    if status == 0 and args.command in WRITES_RESULTS and os.path.exists(cfg["index_file"]):
+        _update_index(cfg)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
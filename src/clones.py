@@ -0,0 +1,227 @@
+"""Monte Carlo clone propagation from SBDB orbit uncertainties.
+
+Virtual clones are sampled around each nominal orbit, either from the element
+sigmas or from the covariance matrix when the SBDB file carries one (fetch it
+with fetch_sbdb(..., full_precision=True, covariance=True)). All clones of all
+objects are propagated together as test particles in a single REBOUND
+simulation, and only the per-epoch position dispersion is written out.
+
+Usage:
+    python src/clones.py "99942 Apophis" "2023 DW" --clones 2000
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from elements import ELEMENT_KEYS, elements_to_state, add_states, mean_motion
+from ephemeris import jd_from_date
+from epochs import advance
+from solar_system import planet_simulation
+
+# -------------------- Config --------------------
+DATA_DIR = "data"
+OUTPUT_DIR = os.path.join("results", "clones")
+
+# SBDB covariance labels -> our element names
+COV_LABELS = {"e": "e", "q": "q", "tp": "tp", "node": "om", "peri": "w", "i": "i"}
+
+start_date = datetime(2025, 1, 1)
+end_date = datetime(2044, 12, 31)
+delta_days = 5
+
+
+# -------------------- Loading --------------------
+def load_orbit(path):
+    """Read nominal elements, their sigmas and (if present) the covariance from an SBDB JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    orbit = data["orbit"]
+    nominal = {e["name"]: float(e["value"]) for e in orbit["elements"] if e.get("value") is not None}
+    sigmas = {
+        e["name"]: float(e["sigma"])
+        for e in orbit["elements"]
+        if e.get("sigma") not in (None, "")
+    }
+
+    cov = orbit.get("covariance")
+    if cov and cov.get("data"):
+        labels = cov["labels"]
+        # Only the six orbital elements are sampled; non-grav parameters are dropped
+        keep = [k for k, lab in enumerate(labels) if lab in COV_LABELS]
+        matrix = np.array(cov["data"], dtype=float)[np.ix_(keep, keep)]
+        cov_nominal = {e["name"]: float(e["value"]) for e in cov.get("elements", [])}
+        cov = {
+            "labels": [COV_LABELS[labels[k]] for k in keep],
+            "matrix": matrix,
+            "nominal": cov_nominal,
+            "epoch": float(cov["epoch"]),
+        }
+    else:
+        cov = None
+
+    return {"nominal": nominal, "sigmas": sigmas, "covariance": cov, "epoch": float(orbit["epoch"])}
+
+
+# -------------------- Clone generation --------------------
+def _from_cometary(e, q, tp, om, w, i, epoch):
+    """Convert (e, q, tp) cometary elements to (a, ma, q) at the given epoch, for any conic.
+
+    a is negative for hyperbolic and infinite for parabolic clones; ma is the
+    matching (elliptic, hyperbolic or Barker) mean anomaly.
+    """
+    with np.errstate(divide="ignore"):
+        a = np.where(e == 1.0, np.inf, q / (1.0 - e))
+    ma = mean_motion(a, e, q) * (epoch - tp)
+    ma = np.where(e < 1.0, np.mod(ma, 360.0), ma)
+    return {"a": a, "e": e, "i": i, "om": om, "w": w, "ma": ma, "q": q}
+
+
+def generate_clones(orbit, n_clones, rng=None, epoch=None):
+    """Sample n_clones element sets (clone 0 is always the nominal orbit).
+
+    Uses the full covariance when available, otherwise independent normal
+    draws from the element sigmas. Returns a dict of arrays keyed by
+    ELEMENT_KEYS + ["q"] (angles in degrees), with ma at epoch (JD; default:
+    the epoch of the orbit solution).
+
+    Covariance clones are sampled in cometary elements (q, e, tp), which stay
+    valid across e = 1, so near-parabolic and hyperbolic clouds keep their
+    spread. Raises ValueError when a cloud cannot be represented (e < 0 or
+    q <= 0 draws, or sigma clones that straddle e = 1).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    cov = orbit["covariance"]
+
+    if cov is not None:
+        nominal = cov["nominal"]
+        mean = np.array([nominal[lab] for lab in cov["labels"]])
+        draws = rng.multivariate_normal(mean, cov["matrix"], size=n_clones)
+        draws[0] = mean
+        cols = {lab: draws[:, k] for k, lab in enumerate(cov["labels"])}
+        if (cols["e"] < 0.0).any() or (cols["q"] <= 0.0).any():
+            raise ValueError("covariance draws with e < 0 or q <= 0")
+        return _from_cometary(cols["e"], cols["q"], cols["tp"],
+                              cols["om"], cols["w"], cols["i"], cov["epoch"] if epoch is None else epoch)
+
+    nominal, sigmas = orbit["nominal"], orbit["sigmas"]
+    clones = {}
+    for key in ELEMENT_KEYS:
+        values = rng.normal(nominal[key], sigmas.get(key, 0.0), size=n_clones)
+        values[0] = nominal[key]
+        clones[key] = values
+    # Independent (a, e) draws have no consistent meaning across e = 1
+    if (clones["e"] < 0.0).any() or ((clones["e"] >= 1.0).any() and (clones["e"] < 1.0).any()):
+        raise ValueError("element-sigma clones cross e = 1 (or e < 0); fetch the covariance instead")
+    clones["q"] = clones["a"] * (1.0 - clones["e"])
+    if epoch is not None:
+        clones["ma"] = advance(dict(clones, epoch=orbit["epoch"]), epoch)
+    return clones
+
+
+# -------------------- Propagation --------------------
+def build_simulation(clone_sets):
+    """One simulation: Sun + planets as active bodies, every clone as a test particle"""
+    sim = planet_simulation()
+
+    columns = {k: np.concatenate([clones[k] for clones in clone_sets.values()]) for k in ELEMENT_KEYS + ["q"]}
+    add_states(sim, elements_to_state(**columns))
+
+    sim.move_to_com()
+    return sim
+
+
+def propagate_clones(clone_sets, times):
+    """Integrate all clone sets together and summarise heliocentric dispersion per epoch.
+
+    clone_sets maps object name -> clones (all with the same clone count).
+    Returns a dict of name -> DataFrame with the nominal position, per-axis
+    clone sigma, and RMS / max offset of the clones from the nominal orbit.
+    """
+    names = list(clone_sets)
+    n_clones = len(clone_sets[names[0]]["a"])
+    sim = build_simulation(clone_sets)
+    first = sim.N_active
+
+    xyz = np.zeros((sim.N, 3), dtype="float64")
+    stats = {name: [] for name in names}
+
+    for t in times:
+        sim.integrate(t)
+        sim.serialize_particle_data(xyz=xyz)
+
+        helio = xyz[first:] - xyz[0]
+        helio = helio.reshape(len(names), n_clones, 3)
+        nominal = helio[:, 0, :]
+        offsets = np.linalg.norm(helio - nominal[:, None, :], axis=2)
+        sigma = helio.std(axis=1)
+        rms = np.sqrt(np.mean(offsets**2, axis=1))
+        worst = offsets.max(axis=1)
+
+        datetime_str = (start_date + timedelta(days=int(t))).strftime("A.D. %Y-%b-%d 00:00:00.0000")
+        for k, name in enumerate(names):
+            stats[name].append([
+                datetime_str,
+                *nominal[k], *sigma[k],
+                rms[k], worst[k]
+            ])
+
+    columns = ["datetime_str", "x", "y", "z",
+               "sigma_x", "sigma_y", "sigma_z",
+               "spread_rms_AU", "spread_max_AU"]
+    return {name: pd.DataFrame(rows, columns=columns) for name, rows in stats.items()}
+
+
+# -------------------- Run --------------------
+def run(targets, n_clones=1000, seed=None, data_dir=DATA_DIR, output_dir=OUTPUT_DIR):
+    """Generate clones for each target's data/ JSON, propagate them together and save summaries"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    clone_sets = {}
+    for target in targets:
+        name = target.replace(" ", "_")
+        file_path = os.path.join(data_dir, f"{name}.json")
+        if not os.path.exists(file_path):
+            print(f"[WARNING] Skipping {name}: JSON file not found.")
+            continue
+        orbit = load_orbit(file_path)
+        source = "covariance" if orbit["covariance"] is not None else "element sigmas"
+        try:
+            clone_sets[name] = generate_clones(orbit, n_clones, rng, epoch=jd_from_date(start_date))
+        except ValueError as e:
+            print(f"[WARNING] Skipping {name}: {e}")
+            continue
+        print(f"[INFO] {name}: {n_clones} clones from {source}")
+
+    if not clone_sets:
+        print("No orbits loaded.")
+        return {}
+
+    times = np.arange(0, (end_date - start_date).days + delta_days, delta_days)
+    print(f"[INFO] Propagating {len(clone_sets) * n_clones} clones over {len(times)} epochs")
+
+    results = propagate_clones(clone_sets, times)
+    for name, df in results.items():
+        csv_path = os.path.join(output_dir, f"{name}_Clones.csv")
+        df.to_csv(csv_path, index=False)
+        print(f"{name:<25} — Saved")
+
+    print(f"\nClone dispersion summaries saved in {output_dir}/")
+    return results
+
+
+# -------------------- Main --------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="+", help="asteroid names as in targets.txt")
+    parser.add_argument("--clones", type=int, default=1000, help="clones per object (incl. nominal)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if not run(args.targets, args.clones, args.seed):
+        exit(1)
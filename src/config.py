@@ -0,0 +1,53 @@
+"""Pipeline paths and settings.
+
+Defaults are relative to the working directory (the repository root). Override
+any of them with a JSON file passed as --config, named by the RND_CONFIG
+environment variable, or placed at ./rnd_config.json, e.g.
+
+    {"data_dir": "/mnt/nfs/rnd/data", "targets_file": "targets_english.txt"}
+"""
+
+import os
+import json
+
+CONFIG_FILE = "rnd_config.json"
+
+DEFAULTS = {
+    "targets_file": "targets_english.txt",
+    "target_limit": 100,
+    "integrator_profile": "ias15",
+    "batch_size": 256,
+    "store_tolerance_km": None,
+    "data_dir": "data",
+    "sbdb_dir": "sbdb_data",
+    "catalog_file": "asteroids_master.json",
+    "real_dir": os.path.join("results", "real"),
+    "rebound_dir": os.path.join("results", "rebound"),
+    "manual_dir": os.path.join("results", "manual"),
+    "clones_dir": os.path.join("results", "clones"),
+    "analysis_dir": os.path.join("results", "analysis", "unified"),
+    "plot_dir": os.path.join("results", "analysis", "plots"),
+    "zscore_dir": os.path.join("results", "zscore"),
+    "epoch_cache_dir": None,
+    "index_file": os.path.join("results", "index.sqlite"),
+}
+
+
+def load_config(path=None):
+    """DEFAULTS updated with the first config file found (explicit path, $RND_CONFIG, ./rnd_config.json)"""
+    config = dict(DEFAULTS)
+    explicit = path or os.environ.get("RND_CONFIG")
+    path = explicit or CONFIG_FILE
+
+    if explicit and not os.path.exists(path):
+        raise FileNotFoundError(f"Config file not found: {path}")
+
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown config keys in {path}: {sorted(unknown)}")
+        config.update(overrides)
+
+    return config
@@ -0,0 +1,200 @@
+"""Vectorized orbital elements -> heliocentric state vector conversion.
+
+Converts whole catalog columns (a, e, i, om, w, ma) to Cartesian states in one
+call instead of one sim.add(a=..., ...) per body, and seeds REBOUND
+simulations from the resulting arrays. Elliptic (e < 1), parabolic (e == 1,
+given q) and hyperbolic (e > 1, a < 0 as in SBDB) orbits are supported.
+"""
+
+import os
+import json
+import numpy as np
+
+import kepler
+
+K_GAUSS = 0.01720209895          # rad/day, Gaussian gravitational constant
+MU_SUN = K_GAUSS**2              # AU^3/day^2 with Msun = 1
+
+ELEMENT_KEYS = ["a", "e", "i", "om", "w", "ma"]
+
+
+# -------------------- Kepler's equation --------------------
+def solve_kepler(M, e, tol=1e-12, max_iter=50, epochs=None):
+    """Eccentric anomaly E for arrays of mean anomaly M [rad] and e < 1.
+
+    With epochs, M holds consecutive epochs per object (object-major) and is
+    solved as a warm-started time grid (see kepler.py).
+    """
+    M, e = np.broadcast_arrays(np.asarray(M, dtype=float), np.asarray(e, dtype=float))
+    if epochs and M.size % epochs == 0 and M.size // epochs >= kepler.WARM_MIN_OBJECTS:
+        E, _ = kepler.solve_grid(M.reshape(-1, epochs), e.reshape(-1, epochs)[:, 0], tol=tol, max_iter=max_iter)
+        return E.ravel()
+    return kepler.solve(M, e, tol=tol, max_iter=max_iter)[0]
+
+
+def solve_kepler_hyperbolic(M, e, tol=1e-12, max_iter=50):
+    """Hyperbolic anomaly H for arrays of mean anomaly M [rad] and e > 1"""
+    H = np.arcsinh(M / e)
+    for _ in range(max_iter):
+        dH = (e * np.sinh(H) - H - M) / (e * np.cosh(H) - 1.0)
+        H -= dH
+        if np.all(np.abs(dH) < tol):
+            break
+    return H
+
+
+# -------------------- Conversion --------------------
+def elements_to_state(a, e, i, om, w, ma, q=None, mu=MU_SUN, degrees=True, epochs=None):
+    """Heliocentric states for arrays of orbital elements.
+
+    Angles are in degrees unless degrees=False. For hyperbolic orbits a is
+    negative and ma is the hyperbolic mean anomaly; for parabolic orbits q
+    must be given and ma is the parabolic mean anomaly sqrt(mu/(2 q^3)) (t - tp).
+    epochs: the inputs are object-major runs of this many time steps, so
+    Kepler's equation is warm-started along time.
+    Returns an (N, 6) array of x, y, z [AU], vx, vy, vz [AU/day].
+    """
+    a, e, i, om, w, ma = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, e, i, om, w, ma)))
+    if degrees:
+        i, om, w, ma = np.radians(i), np.radians(om), np.radians(w), np.radians(ma)
+
+    # Semi-latus rectum works for every conic; parabolas need q
+    if q is None:
+        p = a * (1.0 - e * e)
+    else:
+        q = np.broadcast_to(np.asarray(q, dtype=float), a.shape)
+        with np.errstate(invalid="ignore"):
+            p = np.where(e == 1.0, 2.0 * q, a * (1.0 - e * e))
+
+    elliptic = e < 1.0
+    hyperbolic = e > 1.0
+    parabolic = ~(elliptic | hyperbolic)
+
+    nu = np.zeros_like(e)
+    if elliptic.any():
+        E = solve_kepler(ma[elliptic], e[elliptic], epochs=epochs)
+        ee = e[elliptic]
+        nu[elliptic] = 2.0 * np.arctan2(np.sqrt(1 + ee) * np.sin(E / 2), np.sqrt(1 - ee) * np.cos(E / 2))
+    if hyperbolic.any():
+        H = solve_kepler_hyperbolic(ma[hyperbolic], e[hyperbolic])
+        ee = e[hyperbolic]
+        nu[hyperbolic] = 2.0 * np.arctan(np.sqrt((ee + 1) / (ee - 1)) * np.tanh(H / 2))
+    if parabolic.any():
+        # Barker's equation: M = D + D^3/3 with D = tan(nu/2)
+        Mp = ma[parabolic]
+        s = np.cbrt(1.5 * Mp + np.sqrt(1.0 + 2.25 * Mp**2))
+        nu[parabolic] = 2.0 * np.arctan(s - 1.0 / s)
+
+    cos_nu, sin_nu = np.cos(nu), np.sin(nu)
+    r = p / (1.0 + e * cos_nu)
+    sqrt_mu_p = np.sqrt(mu / p)
+
+    # Perifocal frame
+    x_pf = r * cos_nu
+    y_pf = r * sin_nu
+    vx_pf = -sqrt_mu_p * sin_nu
+    vy_pf = sqrt_mu_p * (e + cos_nu)
+
+    cosO, sinO = np.cos(om), np.sin(om)
+    cosw, sinw = np.cos(w), np.sin(w)
+    cosi, sini = np.cos(i), np.sin(i)
+
+    r11 = cosO * cosw - sinO * sinw * cosi
+    r12 = -cosO * sinw - sinO * cosw * cosi
+    r21 = sinO * cosw + cosO * sinw * cosi
+    r22 = -sinO * sinw + cosO * cosw * cosi
+    r31 = sinw * sini
+    r32 = cosw * sini
+
+    return np.column_stack([
+        r11 * x_pf + r12 * y_pf,
+        r21 * x_pf + r22 * y_pf,
+        r31 * x_pf + r32 * y_pf,
+        r11 * vx_pf + r12 * vy_pf,
+        r21 * vx_pf + r22 * vy_pf,
+        r31 * vx_pf + r32 * vy_pf,
+    ])
+
+
+def mean_motion(a, e, q=None, mu=MU_SUN):
+    """Mean motion (deg/day) for any conic; parabolic orbits use sqrt(mu / (2 q^3)) (Barker's equation)"""
+    a, e = np.asarray(a, dtype=float), np.asarray(e, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = np.degrees(np.sqrt(mu / np.abs(a) ** 3))
+        if q is not None:
+            n = np.where(e == 1.0, np.degrees(np.sqrt(mu / (2.0 * np.asarray(q, dtype=float) ** 3))), n)
+    return n
+
+
+def fill_conic(el):
+    """Copy of an element dict with both a and q (SBDB omits a for parabolic orbits)"""
+    el = dict(el)
+    if "a" not in el:
+        el["a"] = np.inf if el["e"] == 1.0 else el["q"] / (1.0 - el["e"])
+    if "q" not in el:
+        el["q"] = el["a"] * (1.0 - el["e"])
+    return el
+
+
+def catalog_columns(records):
+    """Stack element dicts (e.g. asteroids_master.json "orbit" entries) into column arrays (incl. q)"""
+    records = [fill_conic(r) for r in records]
+    return {key: np.array([float(r[key]) for r in records]) for key in ELEMENT_KEYS + ["q"]}
+
+
+def load_catalog(names, data_dir="data", with_epoch=False):
+    """Element columns for every name with an SBDB JSON in data_dir.
+
+    Returns (found_names, columns); names without a file are skipped. With
+    with_epoch=True the columns also hold the osculating epoch (JD).
+    """
+    found, records, epochs = [], [], []
+    for name in names:
+        path = os.path.join(data_dir, f"{name}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        records.append({e['name']: float(e['value']) for e in data['orbit']['elements'] if e.get('value') is not None})
+        epochs.append(float(data['orbit'].get('epoch', np.nan)))
+        found.append(name)
+    columns = catalog_columns(records)
+    if with_epoch:
+        columns["epoch"] = np.array(epochs)
+    return found, columns
+
+
+# -------------------- REBOUND seeding --------------------
+def add_states(sim, states, primary=None):
+    """Append massless particles to sim from an (N, 6) array of states relative to primary.
+
+    primary defaults to sim.particles[0] (the Sun). Particles are created in
+    one pass and their coordinates written with set_serialized_particle_data,
+    so no per-body element conversion happens in Python. REBOUND has no bulk
+    add, so the array is grown with one reb_simulation_add call per particle
+    (the C call sim.add makes, without its per-call Python checks).
+    """
+    from ctypes import byref
+    import rebound
+
+    states = np.asarray(states, dtype="float64")
+    primary = sim.particles[0] if primary is None else primary
+    # Copy the primary's state now: adding particles may reallocate the particle array
+    offset = np.array([primary.x, primary.y, primary.z, primary.vx, primary.vy, primary.vz])
+    first = sim.N
+
+    placeholder = rebound.Particle()
+    if len(states):
+        sim.add(placeholder)    # runs sim.add's checks (e.g. tree box size) once
+        add, ref = rebound.clibrebound.reb_simulation_add, byref(sim)
+        for _ in range(len(states) - 1):
+            add(ref, placeholder)
+
+    xyz = np.zeros((sim.N, 3), dtype="float64")
+    vxvyvz = np.zeros((sim.N, 3), dtype="float64")
+    sim.serialize_particle_data(xyz=xyz, vxvyvz=vxvyvz)
+
+    xyz[first:] = states[:, :3] + offset[:3]
+    vxvyvz[first:] = states[:, 3:] + offset[3:]
+    sim.set_serialized_particle_data(xyz=xyz, vxvyvz=vxvyvz)
+    return first
@@ -0,0 +1,228 @@
+"""Geocentric observer tables (RA/Dec, elongation, phase angle, V) for the whole catalog.
+
+Asteroid positions come from two-body propagation of the SBDB elements from
+their own epoch. Earth comes from the JPL approximate Keplerian elements
+(Standish, valid 1800-2050). Those give the Earth-Moon barycentre, up to
+~4700 km from the geocentre, which is enough for planning. Everything is
+array maths over (objects x epochs); there are no per-object queries.
+
+Light time: the asteroid position is taken at t - tau with
+tau = |r(t - tau) - R_earth(t)| / c, from a second-order Taylor step and two
+iterations. V uses the IAU H,G system. H and G come from phys_par; if H is
+missing it is derived from the diameter and albedo, and G defaults to 0.15.
+
+Usage:
+    python src/ephemeris.py --date 2025-03-01 --max-mag 18
+    python src/cli.py ephem --date 2025-03-01 --min-elongation 90
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+from datetime import datetime
+
+from elements import MU_SUN, ELEMENT_KEYS, elements_to_state, fill_conic, mean_motion
+
+C_AU_PER_DAY = 173.1446326846693
+OBLIQUITY_J2000 = np.radians(84381.448 / 3600.0)
+JD_J2000 = 2451545.0
+
+# Earth-Moon barycentre: J2000 value and rate per Julian century (a AU, angles deg)
+EMB_ELEMENTS = {
+    "a": (1.00000261, 0.00000562),
+    "e": (0.01671123, -0.00004392),
+    "i": (-0.00001531, -0.01294668),
+    "L": (100.46457166, 35999.37244981),
+    "peri": (102.93768193, 0.32327364),
+    "om": (0.0, 0.0),
+}
+
+DEFAULT_G = 0.15
+DEFAULT_MIN_ELONGATION = 60.0   # deg
+DEFAULT_MAX_MAG = 21.0
+MIN_ALTITUDE = 20.0             # deg above the horizon at transit when a latitude is given
+
+BATCH_CELLS = 1_000_000         # objects x epochs evaluated per array pass
+
+
+def jd_from_date(date):
+    """Julian date (0h) of a datetime / 'YYYY-MM-DD' string"""
+    if isinstance(date, str):
+        date = datetime.strptime(date, "%Y-%m-%d")
+    return 2440587.5 + (date - datetime(1970, 1, 1)).total_seconds() / 86400.0
+
+
+# -------------------- Inputs --------------------
+def earth_states(jd):
+    """Heliocentric ecliptic J2000 states (len(jd) x 6) of the Earth-Moon barycentre"""
+    T = (np.atleast_1d(np.asarray(jd, dtype=float)) - JD_J2000) / 36525.0
+    el = {key: v0 + v1 * T for key, (v0, v1) in EMB_ELEMENTS.items()}
+    return elements_to_state(el["a"], el["e"], el["i"], el["om"],
+                             el["peri"] - el["om"], el["L"] - el["peri"])
+
+
+def absolute_magnitude(phys):
+    """(H, G) from an SBDB phys_par dict, deriving H from diameter and albedo when needed"""
+    H = phys.get("H")
+    if H is None and phys.get("diameter") and phys.get("albedo"):
+        H = 5.0 * np.log10(1329.0 / (phys["diameter"] * np.sqrt(phys["albedo"])))
+    return (np.nan if H is None else H), phys.get("G") or DEFAULT_G
+
+
+def load_observables(names, data_dir="data"):
+    """(found, element columns incl. epoch, H, G) from the SBDB JSONs in data_dir"""
+    found, rows = [], []
+    for name in names:
+        path = os.path.join(data_dir, f"{name}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            el = {e['name']: float(e['value']) for e in data['orbit']['elements'] if e.get('value') is not None}
+            el["epoch"] = float(data['orbit']['epoch'])
+            phys = {}
+            for p in data.get('phys_par', []):
+                try:
+                    phys[p['name']] = float(p['value'])
+                except (TypeError, ValueError):
+                    pass
+            el["H"], el["G"] = absolute_magnitude(phys)
+            # SBDB omits a for parabolic orbits
+            el = fill_conic(el)
+            rows.append({key: el[key] for key in ELEMENT_KEYS + ["q", "epoch", "H", "G"] if key in el})
+        except (KeyError, TypeError, ValueError):
+            print(f"[WARNING] Skipping {name}: incomplete orbit")
+            continue
+        found.append(name)
+
+    columns = {key: np.array([r.get(key, np.nan) for r in rows]) for key in ELEMENT_KEYS + ["q", "epoch", "H", "G"]}
+    return found, columns
+
+
+# -------------------- Geometry --------------------
+def _states_at(cols, jd):
+    """Heliocentric states (K x T x 6) of every object at every jd by two-body propagation"""
+    dt = jd[None, :] - cols["epoch"][:, None]
+    n = mean_motion(cols["a"], cols["e"], cols["q"])
+    ma = cols["ma"][:, None] + n[:, None] * dt
+    shape = ma.shape
+
+    def flat(key):
+        return np.broadcast_to(cols[key][:, None], shape).ravel()
+
+    states = elements_to_state(flat("a"), flat("e"), flat("i"), flat("om"), flat("w"), ma.ravel(), q=flat("q"),
+                               epochs=shape[1])
+    return states.reshape(shape[0], shape[1], 6)
+
+
+def hg_magnitude(H, G, r, delta, phase):
+    """IAU H,G apparent magnitude (phase in radians)"""
+    tan_half = np.tan(0.5 * phase)
+    phi1 = np.exp(-3.33 * tan_half ** 0.63)
+    phi2 = np.exp(-1.87 * tan_half ** 1.22)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return H + 5.0 * np.log10(r * delta) - 2.5 * np.log10((1.0 - G) * phi1 + G * phi2)
+
+
+def observer_geometry(cols, jd):
+    """Dict of (objects x epochs) arrays: ra, dec (deg), delta, r (AU), elongation, phase (deg), V, light_time (d)"""
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    states = _states_at(cols, jd)
+    earth = earth_states(jd)[None, :, :3]
+    pos, vel = states[..., :3], states[..., 3:]
+    r0 = np.linalg.norm(pos, axis=2, keepdims=True)
+    accel = -MU_SUN * pos / r0 ** 3
+
+    # Light time: emitted position r(t - tau) from a second-order Taylor step
+    tau = np.zeros(pos.shape[:2] + (1,))
+    for _ in range(2):
+        emitted = pos - vel * tau + 0.5 * accel * tau ** 2
+        tau = np.linalg.norm(emitted - earth, axis=2, keepdims=True) / C_AU_PER_DAY
+    emitted = pos - vel * tau + 0.5 * accel * tau ** 2
+
+    rho = emitted - earth
+    delta = np.linalg.norm(rho, axis=2)
+    r = np.linalg.norm(emitted, axis=2)
+    earth_r = np.linalg.norm(earth, axis=2)
+
+    # Ecliptic -> equatorial J2000
+    ce, se = np.cos(OBLIQUITY_J2000), np.sin(OBLIQUITY_J2000)
+    x, y, z = rho[..., 0], ce * rho[..., 1] - se * rho[..., 2], se * rho[..., 1] + ce * rho[..., 2]
+    ra = np.degrees(np.arctan2(y, x)) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(z / delta, -1.0, 1.0)))
+
+    cos_elong = -np.einsum("ktj,ktj->kt", np.broadcast_to(earth, rho.shape), rho) / (earth_r * delta)
+    cos_phase = np.einsum("ktj,ktj->kt", emitted, rho) / (r * delta)
+    phase = np.arccos(np.clip(cos_phase, -1.0, 1.0))
+
+    return {
+        "ra": ra,
+        "dec": dec,
+        "delta": delta,
+        "r": r,
+        "elongation": np.degrees(np.arccos(np.clip(cos_elong, -1.0, 1.0))),
+        "phase": np.degrees(phase),
+        "V": hg_magnitude(cols["H"][:, None], cols["G"][:, None], r, delta, phase),
+        "light_time": tau[..., 0],
+    }
+
+
+# -------------------- Tables --------------------
+def _batches(found, cols, n_epochs):
+    size = max(1, BATCH_CELLS // max(n_epochs, 1))
+    for s in range(0, len(found), size):
+        yield found[s:s + size], {key: v[s:s + size] for key, v in cols.items()}
+
+
+def ephemeris(names, jd, data_dir="data"):
+    """Long-form observer table: one row per object and epoch"""
+    import pandas as pd
+
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    found, cols = load_observables(names, data_dir)
+    frames = []
+    for batch, bcols in _batches(found, cols, len(jd)):
+        geo = observer_geometry(bcols, jd)
+        frame = pd.DataFrame({key: v.ravel() for key, v in geo.items()})
+        frame.insert(0, "jd", np.tile(jd, len(batch)))
+        frame.insert(0, "object", np.repeat(batch, len(jd)))
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def visibility(names, date, data_dir="data", min_elongation=DEFAULT_MIN_ELONGATION,
+               max_mag=DEFAULT_MAX_MAG, latitude=None):
+    """Objects observable on a night (0h of date): elongation and V cuts, optional Dec limits
+    for a site at latitude (transit altitude >= MIN_ALTITUDE); sorted by brightness"""
+    table = ephemeris(names, [jd_from_date(date)], data_dir)
+    if table.empty:
+        return table
+
+    keep = (table["elongation"] >= min_elongation) & (table["V"] <= max_mag)
+    if latitude is not None:
+        keep &= (table["dec"] > latitude - 90.0 + MIN_ALTITUDE) & (table["dec"] < latitude + 90.0 - MIN_ALTITUDE)
+    return table[keep].sort_values("V", ignore_index=True)
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=0, help="first N targets (0 = all)")
+    parser.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"))
+    parser.add_argument("--min-elongation", type=float, default=DEFAULT_MIN_ELONGATION)
+    parser.add_argument("--max-mag", type=float, default=DEFAULT_MAX_MAG)
+    parser.add_argument("--lat", type=float, default=None, help="observer latitude (deg) for Dec limits")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    table = visibility(read_targets(args.targets, args.limit), args.date, args.data_dir,
+                       args.min_elongation, args.max_mag, args.lat)
+    print(table.to_string(index=False))
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"Saved to: {args.out}")
@@ -0,0 +1,159 @@
+"""Align catalog elements from their native SBDB epochs to one common epoch.
+
+Every SBDB orbit is osculating at its own epoch (JD), but the simulations all
+start at 2025-01-01. Seeding them with the raw ma would start each object at
+a different real time. Here every object is advanced to the target epoch in
+one array pass: the mean anomaly is shifted by n (target - epoch), which is
+the exact two-body step for any conic (hyperbolic M and Barker's parabolic M
+are linear in time too). The states then come from one elements_to_state call.
+The planets in solar_system are already osculating at 2025-01-01.
+
+Aligned values can be cached per (element hash, target epoch) by passing a
+cache_dir (config key epoch_cache_dir; off by default). The hash covers a, e,
+i, om, w, ma, q and the epoch, so a refreshed orbit is recomputed and an
+unchanged one is read back. There is one .npz per target epoch in cache_dir.
+
+Usage:
+    python src/epochs.py --date 2025-01-01 --limit 0 --cache-dir results/cache/epochs
+    python src/cli.py align --date 2025-01-01
+"""
+
+import os
+import hashlib
+import argparse
+import numpy as np
+
+from elements import ELEMENT_KEYS, elements_to_state, fill_conic, load_catalog, mean_motion
+from ephemeris import jd_from_date
+
+REFERENCE_DATE = "2025-01-01"       # start of every simulation
+HASH_KEYS = ELEMENT_KEYS + ["q", "epoch"]
+ALIGNED_FILE = "Aligned_Elements.csv"
+
+
+def element_hashes(cols):
+    """64-bit hash per object of its elements and epoch (uint64 array)"""
+    rows = np.ascontiguousarray(np.column_stack([np.asarray(cols[key], dtype="float64") for key in HASH_KEYS]))
+    return np.array([int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little")
+                     for row in rows], dtype=np.uint64)
+
+
+def advance(cols, target_jd):
+    """Mean anomaly (deg) of every object at target_jd; wrapped to [0, 360) for ellipses"""
+    ma = cols["ma"] + mean_motion(cols["a"], cols["e"], cols["q"]) * (target_jd - cols["epoch"])
+    return np.where(cols["e"] < 1.0, np.mod(ma, 360.0), ma)
+
+
+def advance_record(el, epoch, date=REFERENCE_DATE):
+    """Copy of one SBDB element dict with ma moved from epoch (JD) to date (with a and q filled in)"""
+    el = fill_conic(el)
+    return dict(el, ma=float(advance(dict(el, epoch=epoch), jd_from_date(date))))
+
+
+# -------------------- Cache --------------------
+def cache_path(cache_dir, target_jd):
+    return os.path.join(cache_dir, f"aligned_{target_jd:.5f}.npz")
+
+
+def _read_cache(path):
+    if not os.path.exists(path):
+        return np.empty(0, dtype=np.uint64), np.empty(0), np.empty((0, 6))
+    with np.load(path) as cache:
+        return cache["hash"], cache["ma"], cache["states"]
+
+
+def _write_cache(path, hashes, ma, states):
+    """Write via a temp file so an interrupted write never corrupts the cache"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    order = np.argsort(hashes)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, hash=hashes[order], ma=ma[order], states=states[order])
+    os.replace(tmp, path)
+
+
+def align(cols, target_jd, cache_dir=None):
+    """(ma at target_jd, states (K x 6) at target_jd) for element columns incl. q and epoch.
+
+    Objects already in the cache for this target epoch are read back, and the
+    rest are advanced together in one pass and added to it. Without
+    cache_dir everything is advanced and nothing is written.
+    """
+    cols = {key: np.atleast_1d(np.asarray(cols[key], dtype=float)) for key in HASH_KEYS}
+    if np.isnan(cols["epoch"]).any():
+        raise ValueError("Every object needs an epoch to be aligned")
+    size = len(cols["ma"])
+    ma, states = np.empty(size), np.empty((size, 6))
+    missing = np.ones(size, dtype=bool)
+
+    if cache_dir:
+        path = cache_path(cache_dir, target_jd)
+        hashes = element_hashes(cols)
+        cached_hash, cached_ma, cached_states = _read_cache(path)
+        pos = np.searchsorted(cached_hash, hashes)
+        pos[pos == len(cached_hash)] = 0
+        hit = (cached_hash[pos] == hashes) if len(cached_hash) else np.zeros(size, dtype=bool)
+        ma[hit], states[hit] = cached_ma[pos[hit]], cached_states[pos[hit]]
+        missing = ~hit
+
+    if missing.any():
+        sub = {key: v[missing] for key, v in cols.items()}
+        ma[missing] = advance(sub, target_jd)
+        states[missing] = elements_to_state(sub["a"], sub["e"], sub["i"], sub["om"], sub["w"], ma[missing],
+                                            q=sub["q"])
+        if cache_dir:
+            new = np.unique(hashes[missing], return_index=True)[1]
+            rows = np.flatnonzero(missing)[new]
+            _write_cache(path, np.concatenate([cached_hash, hashes[rows]]), np.concatenate([cached_ma, ma[rows]]),
+                         np.concatenate([cached_states, states[rows]]))
+    return ma, states
+
+
+def aligned_catalog(names, data_dir="data", date=REFERENCE_DATE, cache_dir=None):
+    """(found, element columns with ma at date, states (K x 6) at date) for every name with an SBDB JSON"""
+    found, cols = load_catalog(names, data_dir, with_epoch=True)
+    if not found:
+        return found, cols, np.empty((0, 6))
+    ma, states = align(cols, jd_from_date(date), cache_dir)
+    cols = dict(cols, ma=ma, epoch=np.full(len(found), jd_from_date(date)))
+    return found, cols, states
+
+
+def run(names, data_dir="data", date=REFERENCE_DATE, output_dir=os.path.join("results", "analysis", "unified"),
+        cache_dir=None):
+    """Write the catalog aligned to date (elements and states) as one CSV"""
+    import pandas as pd
+
+    found, native = load_catalog(names, data_dir, with_epoch=True)
+    if not found:
+        raise ValueError("No objects with element files found")
+    target_jd = jd_from_date(date)
+    ma, states = align(native, target_jd, cache_dir)
+
+    table = pd.DataFrame({"object": found, "epoch_jd": native["epoch"], "dt_days": target_jd - native["epoch"]})
+    for key in ELEMENT_KEYS + ["q"]:
+        table[key] = ma if key == "ma" else native[key]
+    for k, key in enumerate(["x", "y", "z", "vx", "vy", "vz"]):
+        table[key] = states[:, k]
+
+    os.makedirs(output_dir, exist_ok=True)
+    out = os.path.join(output_dir, ALIGNED_FILE)
+    table.to_csv(out, index=False)
+    spread = np.abs(table["dt_days"])
+    print(f"[INFO] {len(found)} objects aligned to {date} (JD {target_jd:.1f}); "
+          f"native epochs up to {spread.max():.0f} d away (median {spread.median():.0f} d)")
+    print(f"Aligned elements saved to: {out}")
+    return table
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=100, help="first N targets (0 = all)")
+    parser.add_argument("--date", default=REFERENCE_DATE, help="common epoch, YYYY-MM-DD (0h)")
+    parser.add_argument("--cache-dir", default=None, help="read / extend the epoch cache in this directory")
+    args = parser.parse_args()
+
+    run(read_targets(args.targets, args.limit), args.data_dir, args.date, cache_dir=args.cache_dir)
@@ -0,0 +1,258 @@
+"""Event detection during the integration: planet encounters, perihelia and r crossings.
+
+The 5-day CSV samples miss anything shorter than a sample (a fast close pass
+falls between two rows). Instead, a REBOUND heartbeat is called after every
+integrator step and checks the event functions for every asteroid at once:
+
+    encounter  |x - x_planet| - D          enter / exit (sign change)
+    closest    (x - x_p) . (v - v_p)       - to + while inside D
+    perihelion x . v  (heliocentric)        - to +
+    r crossing |x| - R                     r_in / r_out (sign change)
+
+An event found between two steps is refined on the cubic Hermite
+interpolant of the two step states (positions and velocities), so the time
+is as good as the integrator's own steps, with no dense output and no
+re-integration. A closest approach that enters and leaves D within one step
+still gives its enter/exit pair. Every orbit is first advanced from its own
+SBDB epoch to the start date (epochs.aligned_catalog), so all objects start
+at the same real time.
+
+Output: one compact row per event (object, event, body, t, date, distance,
+speed), written to Events.csv.
+
+Usage:
+    python src/events.py --years 20 --encounter-au 0.05 --r-au 1.0 1.3
+    python src/cli.py events --years 20
+"""
+
+import os
+import argparse
+import numpy as np
+from datetime import timedelta
+
+from elements import add_states
+from epochs import aligned_catalog
+from solar_system import planet_simulation, planets
+from integrators import PROFILES, configure
+
+EVENTS_FILE = "Events.csv"
+EVENT_COLUMNS = ["object", "event", "body", "t_days", "date", "distance_au", "speed_km_s"]
+
+DEFAULT_YEARS = 20
+DEFAULT_ENCOUNTER_AU = 0.05     # classic close-approach distance
+DEFAULT_R_AU = (1.0, 1.3)       # Earth's orbit and the NEO perihelion limit
+REFINE_ITERATIONS = 48          # bisection halvings of one step (< 1e-14 of the step)
+AU_PER_DAY_TO_KM_S = 149597870.7 / 86400.0
+
+
+# -------------------- Refinement --------------------
+def _hermite(p0, v0, p1, v1, h, s):
+    """Position and velocity at fractions s of a step of length h (cubic Hermite)"""
+    s = s[:, None]
+    s2, s3 = s * s, s * s * s
+    p = (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * h * v0 + (3 * s2 - 2 * s3) * p1 + (s3 - s2) * h * v1
+    v = ((6 * s2 - 6 * s) * p0 + (3 * s2 - 4 * s + 1) * h * v0 + (6 * s - 6 * s2) * p1 + (3 * s2 - 2 * s) * h * v1) / h
+    return p, v
+
+
+def _distance(p, v):
+    return np.linalg.norm(p, axis=-1)
+
+
+def _radial(p, v):
+    return np.einsum("...j,...j->...", p, v)
+
+
+def _refine(p0, v0, p1, v1, h, func, target, lo, hi):
+    """Step fraction where func(p, v) == target inside [lo, hi], by bisection on the interpolant"""
+    f_lo = func(*_hermite(p0, v0, p1, v1, h, lo)) - target
+    for _ in range(REFINE_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        f_mid = func(*_hermite(p0, v0, p1, v1, h, mid)) - target
+        same = np.sign(f_mid) == np.sign(f_lo)
+        lo, f_lo, hi = np.where(same, mid, lo), np.where(same, f_mid, f_lo), np.where(same, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+# -------------------- Detector --------------------
+class EventDetector:
+    """Heartbeat callable: compares each step's states with the previous step's and logs refined events"""
+
+    def __init__(self, sim, first, encounter_au=DEFAULT_ENCOUNTER_AU, r_au=DEFAULT_R_AU):
+        self.first = first
+        self.bodies = list(planets)
+        self.encounter_au = float(encounter_au)
+        self.r_au = np.asarray(r_au, dtype=float)
+        self.xyz = np.zeros((sim.N, 3))
+        self.vxvyvz = np.zeros((sim.N, 3))
+        self.rows = []
+        self.error = None
+        self.t_prev, self.prev = sim.t, self._states(sim)
+
+    def _states(self, sim):
+        """(heliocentric asteroid states, asteroid-minus-planet states), each split as (pos, vel)"""
+        sim.serialize_particle_data(xyz=self.xyz, vxvyvz=self.vxvyvz)
+        pos, vel = self.xyz - self.xyz[0], self.vxvyvz - self.vxvyvz[0]
+        ast_p, ast_v = pos[self.first:], vel[self.first:]
+        pl_p, pl_v = pos[1:1 + len(self.bodies)], vel[1:1 + len(self.bodies)]
+        return (ast_p, ast_v), (ast_p[:, None, :] - pl_p[None], ast_v[:, None, :] - pl_v[None])
+
+    def __call__(self, sim_pointer):
+        # Exceptions inside a ctypes callback are only printed, so keep the first one for raise_error()
+        if self.error is not None:
+            return
+        try:
+            sim = sim_pointer.contents
+            if sim.t == self.t_prev:
+                return
+            now = self._states(sim)
+            self._step(self.prev, now, self.t_prev, sim.t - self.t_prev)
+            self.t_prev, self.prev = sim.t, now
+        except Exception as exc:
+            self.error = exc
+
+    def raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def _log(self, event, k, body, t0, h, s, p, v, distance=None):
+        if len(k) == 0:
+            return
+        d = np.linalg.norm(p, axis=-1) if distance is None else np.full(len(k), distance)
+        self.rows.append((np.full(len(k), event), k, body, t0 + s * h, d,
+                          np.linalg.norm(v, axis=-1) * AU_PER_DAY_TO_KM_S))
+
+    def _step(self, prev, now, t0, h):
+        (p0, v0), (rp0, rv0) = prev
+        (p1, v1), (rp1, rv1) = now
+        sun = -1
+
+        # Perihelion: heliocentric radial velocity changes from - to +
+        k = np.flatnonzero((_radial(p0, v0) < 0) & (_radial(p1, v1) >= 0))
+        if len(k):
+            s = _refine(p0[k], v0[k], p1[k], v1[k], h, _radial, 0.0, np.zeros(len(k)), np.ones(len(k)))
+            p, v = _hermite(p0[k], v0[k], p1[k], v1[k], h, s)
+            self._log("perihelion", k, np.full(len(k), sun), t0, h, s, p, v)
+
+        # Heliocentric distance thresholds
+        r0, r1 = np.linalg.norm(p0, axis=1), np.linalg.norm(p1, axis=1)
+        for R in self.r_au:
+            k = np.flatnonzero((r0 - R) * (r1 - R) < 0)
+            if len(k):
+                s = _refine(p0[k], v0[k], p1[k], v1[k], h, _distance, R, np.zeros(len(k)), np.ones(len(k)))
+                p, v = _hermite(p0[k], v0[k], p1[k], v1[k], h, s)
+                inward = r1[k] < R
+                for event, sel in (("r_in", inward), ("r_out", ~inward)):
+                    self._log(event, k[sel], np.full(sel.sum(), sun), t0, h, s[sel], p[sel], v[sel], R)
+
+        # Planet encounters: (object, planet) pairs flattened
+        D = self.encounter_au
+        d0, d1 = np.linalg.norm(rp0, axis=2), np.linalg.norm(rp1, axis=2)
+        speed = np.maximum(np.linalg.norm(rv0, axis=2), np.linalg.norm(rv1, axis=2))
+        near = np.minimum(d0, d1) < D + speed * abs(h)
+        if not near.any():
+            return
+        k, b = np.nonzero(near)
+        q0, u0, q1, u1 = rp0[k, b], rv0[k, b], rp1[k, b], rv1[k, b]
+        e0, e1 = d0[k, b] - D, d1[k, b] - D
+        ones, zeros = np.ones(len(k)), np.zeros(len(k))
+
+        # Closest approach: relative radial velocity - to +, kept if inside D
+        cross = (_radial(q0, u0) < 0) & (_radial(q1, u1) >= 0)
+        s_min = np.full(len(k), np.nan)
+        if cross.any():
+            c = np.flatnonzero(cross)
+            s_min[c] = _refine(q0[c], u0[c], q1[c], u1[c], h, _radial, 0.0, zeros[c], ones[c])
+            p, v = _hermite(q0[c], u0[c], q1[c], u1[c], h, s_min[c])
+            inside = np.linalg.norm(p, axis=1) < D
+            c, p, v = c[inside], p[inside], v[inside]
+            self._log("closest", k[c], b[c], t0, h, s_min[c], p, v)
+            s_min[np.flatnonzero(cross)[~inside]] = np.nan
+
+        # Sphere entry / exit; a pass entirely within one step is split at its minimum
+        inside_min = ~np.isnan(s_min)
+        brackets = [
+            ("enter", (e0 > 0) & (e1 <= 0), zeros, ones),
+            ("exit", (e0 <= 0) & (e1 > 0), zeros, ones),
+            ("enter", (e0 > 0) & (e1 > 0) & inside_min, zeros, s_min),
+            ("exit", (e0 > 0) & (e1 > 0) & inside_min, s_min, ones),
+        ]
+        for event, sel, lo, hi in brackets:
+            c = np.flatnonzero(sel)
+            if len(c):
+                s = _refine(q0[c], u0[c], q1[c], u1[c], h, _distance, D, lo[c], hi[c])
+                p, v = _hermite(q0[c], u0[c], q1[c], u1[c], h, s)
+                self._log(event, k[c], b[c], t0, h, s, p, v, D)
+
+    def table(self, names):
+        """Event DataFrame in time order"""
+        import pandas as pd
+        from rebound_check import start_date
+
+        if not self.rows:
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+        event, k, body, t, d, v = (np.concatenate(c) for c in zip(*self.rows))
+        names = np.asarray(names)
+        table = pd.DataFrame({
+            "object": names[k],
+            "event": event,
+            "body": [self.bodies[x] if x >= 0 else "Sun" for x in body],
+            "t_days": t,
+            "date": [(start_date + timedelta(days=float(x))).strftime("%Y-%m-%d %H:%M") for x in t],
+            "distance_au": d,
+            "speed_km_s": v,
+        })
+        return table.sort_values(["t_days", "object"], kind="stable", ignore_index=True)
+
+
+def detect_events(names, data_dir="data", years=DEFAULT_YEARS, profile="ias15",
+                  encounter_au=DEFAULT_ENCOUNTER_AU, r_au=DEFAULT_R_AU, cache_dir=None):
+    """Integrate every object with the planets and return the refined event table"""
+    if profile not in PROFILES or PROFILES[profile]["integrator"] is None:
+        raise ValueError(f"Event detection needs a REBOUND profile, not '{profile}'")
+    found, _, states = aligned_catalog(names, data_dir, cache_dir=cache_dir)
+    if not found:
+        raise ValueError("No objects with element files found")
+
+    sim = planet_simulation()
+    first = add_states(sim, states)
+    sim.move_to_com()
+    configure(sim, profile)
+
+    detector = EventDetector(sim, first, encounter_au, r_au)
+    sim.heartbeat = detector
+    print(f"[INFO] Event run: {len(found)} objects, {years} yr, {profile}, "
+          f"encounters < {encounter_au} AU, r = {', '.join(f'{r:g}' for r in r_au)} AU")
+    sim.integrate(years * 365.25)
+    detector.raise_error()
+    return detector.table(found)
+
+
+def run(names, data_dir="data", output_dir=os.path.join("results", "analysis", "unified"),
+        years=DEFAULT_YEARS, profile="ias15", encounter_au=DEFAULT_ENCOUNTER_AU, r_au=DEFAULT_R_AU,
+        cache_dir=None):
+    os.makedirs(output_dir, exist_ok=True)
+    events = detect_events(names, data_dir, years, profile, encounter_au, r_au, cache_dir)
+
+    out = os.path.join(output_dir, EVENTS_FILE)
+    events.to_csv(out, index=False)
+    counts = ", ".join(f"{e}: {k}" for e, k in events["event"].value_counts().items())
+    print(f"{len(events)} events saved to: {out} ({counts or 'none'})")
+    return events
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=100, help="first N targets (0 = all)")
+    parser.add_argument("--years", type=float, default=DEFAULT_YEARS)
+    parser.add_argument("--profile", default="ias15", help="REBOUND integrator profile")
+    parser.add_argument("--encounter-au", type=float, default=DEFAULT_ENCOUNTER_AU)
+    parser.add_argument("--r-au", type=float, nargs="*", default=list(DEFAULT_R_AU))
+    args = parser.parse_args()
+
+    run(read_targets(args.targets, args.limit), args.data_dir, years=args.years,
+        profile=args.profile, encounter_au=args.encounter_au, r_au=args.r_au)
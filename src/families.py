@@ -0,0 +1,212 @@
+"""Orbital-element neighbour search and family extraction (HCM) over the catalog.
+
+Objects are indexed in a KD-tree over scaled (ln a, e, sin i). The default
+metric is the Zappala et al. (1990) d-metric, in m/s:
+
+    d = n*a * sqrt(k1 (d ln a)^2 + k2 (de)^2 + k3 (d sin i)^2),  k = (5/4, 2, 2)
+
+with n*a taken at the mean a of the pair (d ln a ~ da/a). Because n*a varies
+with a, the tree is queried with a slightly enlarged, conservative radius and
+the candidates are then filtered with the exact metric, so results are exact.
+The "euclidean" metric is plain distance in (a, e, sin i).
+
+Families come from the hierarchical clustering method: single linkage at a
+cutoff velocity, i.e. connected components of the radius graph. Groups with
+at least min_members objects are labelled after their lowest-numbered member;
+everything else is background. Works on osculating elements (the catalog) or
+on proper elements passed in as arrays.
+
+Usage:
+    python src/families.py --cutoff 70 --min-members 5
+    python src/cli.py families --cutoff 70 --neighbours "433 Eros"
+"""
+
+import re
+import json
+import argparse
+import numpy as np
+
+from elements import MU_SUN
+
+AU_PER_DAY_TO_M_PER_S = 149597870700.0 / 86400.0
+
+METRICS = {
+    "zappala": (5.0 / 4.0, 2.0, 2.0),
+    "euclidean": None,
+}
+DEFAULT_CUTOFF = 70.0       # m/s for zappala
+DEFAULT_MIN_MEMBERS = 5
+
+
+def orbital_velocity(a):
+    """n*a in m/s for semi-major axis a (AU)"""
+    return np.sqrt(MU_SUN / a) * AU_PER_DAY_TO_M_PER_S
+
+
+class ElementIndex:
+    """KD-tree over (a, e, sin i) answering radius queries in the chosen metric"""
+
+    def __init__(self, a, e, inc, metric="zappala", degrees=True):
+        from scipy.spatial import cKDTree
+
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (choose from {sorted(METRICS)})")
+        self.metric = metric
+        self.a = np.asarray(a, dtype=float)
+        self.e = np.asarray(e, dtype=float)
+        self.sin_i = np.sin(np.radians(inc)) if degrees else np.sin(np.asarray(inc, dtype=float))
+
+        weights = METRICS[metric]
+        if weights is None:
+            self.coords = np.column_stack([self.a, self.e, self.sin_i])
+        else:
+            k = np.sqrt(weights)
+            self.coords = np.column_stack([k[0] * np.log(self.a), k[1] * self.e, k[2] * self.sin_i])
+        self.tree = cKDTree(self.coords)
+
+    def __len__(self):
+        return len(self.a)
+
+    def _search_radius(self, a, cutoff):
+        """Tree radius (scaled units) guaranteed to contain every pair within cutoff"""
+        if METRICS[self.metric] is None:
+            return np.full(len(a), float(cutoff))
+        # A partner within scaled distance r has a <= a*exp(r/k1), so n*a at the pair mean is at
+        # least n*a(a)*exp(-r/2k1). Iterate r = cutoff / that bound up to its fixed point.
+        k1 = np.sqrt(METRICS[self.metric][0])
+        base = cutoff / orbital_velocity(np.asarray(a, dtype=float))
+        r = base
+        for _ in range(50):
+            r_next = base * np.exp(0.5 * r / k1)
+            if np.all(r_next - r <= 1e-12 * r_next):
+                return r_next * (1.0 + 1e-9)
+            r = r_next
+        # No fixed point: the cutoff is so large that everything is a candidate
+        return np.where(r_next - r <= 1e-12 * r_next, r_next * (1.0 + 1e-9), np.inf)
+
+    def distance(self, i, j):
+        """Metric distance between index arrays i and j"""
+        i, j = np.asarray(i), np.asarray(j)
+        dx = np.linalg.norm(self.coords[i] - self.coords[j], axis=-1)
+        if METRICS[self.metric] is None:
+            return dx
+        return orbital_velocity(0.5 * (self.a[i] + self.a[j])) * dx
+
+    def pairs(self, cutoff, workers=-1):
+        """(i, j, d) arrays of every pair i < j closer than cutoff"""
+        radius = self._search_radius(self.a, cutoff)
+        # Each point's radius already bounds all of its partners, so keeping i < j loses nothing
+        hits = self.tree.query_ball_point(self.coords, radius, workers=workers)
+        counts = np.fromiter((len(h) for h in hits), dtype=np.int64, count=len(hits))
+        i = np.repeat(np.arange(len(hits)), counts)
+        j = np.fromiter((x for h in hits for x in h), dtype=np.int64, count=counts.sum())
+        keep = i < j
+        i, j = i[keep], j[keep]
+        d = self.distance(i, j)
+        close = d <= cutoff
+        return i[close], j[close], d[close]
+
+    def neighbours(self, queries, cutoff, workers=-1):
+        """For each query index, (indices, distances) of the other objects within cutoff, nearest first"""
+        queries = np.atleast_1d(queries)
+        radius = self._search_radius(self.a[queries], cutoff)
+        hits = self.tree.query_ball_point(self.coords[queries], radius, workers=workers)
+        out = []
+        for q, h in zip(queries, hits):
+            h = np.array([x for x in h if x != q], dtype=np.int64)
+            d = self.distance(np.full(len(h), q), h)
+            h, d = h[d <= cutoff], d[d <= cutoff]
+            order = np.argsort(d)
+            out.append((h[order], d[order]))
+        return out
+
+
+def find_families(index, cutoff=DEFAULT_CUTOFF, min_members=DEFAULT_MIN_MEMBERS):
+    """Single-linkage clusters at cutoff; returns a component id per object (-1 = background)"""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    i, j, _ = index.pairs(cutoff)
+    n = len(index)
+    graph = coo_matrix((np.ones(len(i), dtype=np.int8), (i, j)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    sizes = np.bincount(labels)
+    return np.where(sizes[labels] >= min_members, labels, -1)
+
+
+def _number(name):
+    m = re.match(r"^\(?(\d+)\s", name)
+    return int(m.group(1)) if m else np.inf
+
+
+def family_names(names, labels):
+    """Label each family after its lowest-numbered member (or first name); background -> None"""
+    out = [None] * len(names)
+    members = {}
+    for k, label in enumerate(labels):
+        if label >= 0:
+            members.setdefault(label, []).append(k)
+    for ks in members.values():
+        parent = min(ks, key=lambda k: (_number(names[k]), names[k]))
+        for k in ks:
+            out[k] = names[parent]
+    return out
+
+
+# -------------------- Catalog --------------------
+def _bound(row):
+    """Catalog rows usable for the metric: a, e, i present and an elliptic orbit"""
+    orbit = row.get("orbit", {})
+    return all(orbit.get(k) is not None for k in ("a", "e", "i")) and orbit["a"] > 0 and orbit["e"] < 1
+
+
+def label_catalog(catalog_file="asteroids_master.json", cutoff=DEFAULT_CUTOFF,
+                  min_members=DEFAULT_MIN_MEMBERS, metric="zappala"):
+    """Add a "family" field to every catalog record (None = background) and save the catalog"""
+    with open(catalog_file, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    rows = [r for r in catalog if _bound(r)]
+
+    index = ElementIndex([r["orbit"]["a"] for r in rows], [r["orbit"]["e"] for r in rows],
+                         [r["orbit"]["i"] for r in rows], metric)
+    labels = family_names([r["name"] for r in rows], find_families(index, cutoff, min_members))
+
+    for row in catalog:
+        row["family"] = None
+    for row, family in zip(rows, labels):
+        row["family"] = family
+
+    with open(catalog_file, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2)
+
+    n_families = len({f for f in labels if f})
+    n_members = sum(f is not None for f in labels)
+    print(f"[INFO] {n_families} families, {n_members} members of {len(rows)} objects "
+          f"(cutoff {cutoff} {'m/s' if metric == 'zappala' else ''}, min {min_members})")
+    return index, rows, labels
+
+
+def print_neighbours(index, rows, query, cutoff):
+    key = query.lower().replace("_", " ")
+    matches = [k for k, r in enumerate(rows) if r["name"].lower().startswith(key)]
+    if not matches:
+        print(f"[ERROR] {query} not in catalog")
+        return
+    for q, (idx, dist) in zip(matches, index.neighbours(matches, cutoff)):
+        print(f"{rows[q]['name']}: {len(idx)} neighbours within {cutoff}")
+        for k, d in zip(idx, dist):
+            print(f"  {rows[k]['name']:<35} {d:10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog", default="asteroids_master.json")
+    parser.add_argument("--metric", choices=sorted(METRICS), default="zappala")
+    parser.add_argument("--cutoff", type=float, default=DEFAULT_CUTOFF)
+    parser.add_argument("--min-members", type=int, default=DEFAULT_MIN_MEMBERS)
+    parser.add_argument("--neighbours", nargs="*", default=[], help="also list neighbours of these objects")
+    args = parser.parse_args()
+
+    index, rows, _ = label_catalog(args.catalog, args.cutoff, args.min_members, args.metric)
+    for name in args.neighbours:
+        print_neighbours(index, rows, name, args.cutoff)
@@ -0,0 +1,142 @@
+"""Integrator profiles for the Sun + one body simulations.
+
+A profile names a REBOUND integrator setup (or the analytic two-body
+solution) so runs can trade precision for speed:
+
+    ias15       REBOUND default, adaptive step (reference)
+    whfast      WHFast, fixed 1-day step
+    whfast-5d   WHFast, step equal to the 5-day output cadence
+    mercurius   MERCURIUS, fixed 1-day step (switches to IAS15 near planets)
+    twobody     analytic two-body propagation (any conic), no integration at all
+
+"auto" picks a profile per object class (see select_profile). The report
+(profile_report / `cli.py profiles`) times each profile and measures its RMS
+position error against the Horizons vectors in results/real.
+"""
+
+import os
+import time
+import numpy as np
+
+import trajstore
+from universal import propagate_batch
+
+PROFILES = {
+    "ias15":     {"integrator": "ias15"},
+    "whfast":    {"integrator": "whfast", "dt": 1.0},
+    "whfast-5d": {"integrator": "whfast", "dt": 5.0},
+    "mercurius": {"integrator": "mercurius", "dt": 1.0},
+    "twobody":   {"integrator": None},
+}
+
+# "auto": eccentric / Sun-grazing orbits keep the adaptive integrator
+AUTO_HIGH_E = 0.5
+AUTO_MIN_Q = 0.3         # AU
+AUTO_PRECISE = "ias15"
+AUTO_DEFAULT = "whfast"
+
+
+def select_profile(profile, el):
+    """Resolve "auto" to a concrete profile from the object's elements"""
+    if profile != "auto":
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown integrator profile '{profile}' (choose from {sorted(PROFILES)} or 'auto')")
+        return profile
+    q = el['a'] * (1.0 - el['e'])
+    if el['e'] > AUTO_HIGH_E or q < AUTO_MIN_Q:
+        return AUTO_PRECISE
+    return AUTO_DEFAULT
+
+
+def configure(sim, profile):
+    """Apply a REBOUND profile's integrator settings to sim"""
+    settings = PROFILES[profile]
+    sim.integrator = settings["integrator"]
+    if "dt" in settings:
+        sim.dt = settings["dt"]
+
+
+def propagate(a, e, i, om, w, ma, times, profile="ias15"):
+    """States (len(times) x 6) of one body around the Sun under the given profile"""
+    if profile == "twobody":
+        return propagate_batch(a, e, i, om, w, ma, times)[0]
+
+    import rebound
+
+    sim = rebound.Simulation()
+    sim.units = ('AU', 'day', 'Msun')
+    sim.add(m=1.0)  # Sun
+    sim.add(
+        a=a,
+        e=e,
+        inc=np.radians(i),
+        Omega=np.radians(om),
+        omega=np.radians(w),
+        M=np.radians(ma)
+    )
+    sim.move_to_com()
+    configure(sim, profile)
+
+    states = np.empty((len(times), 6))
+    for k, t in enumerate(times):
+        sim.integrate(t)
+        p = sim.particles[1]
+        states[k] = (p.x, p.y, p.z, p.vx, p.vy, p.vz)
+    return states
+
+
+# -------------------- Accuracy / throughput report --------------------
+def profile_report(targets, data_dir, real_dir, times, start_date, profiles=None):
+    """Wall time and RMS position error vs Horizons for each profile.
+
+    Only objects that have both a data/ JSON and a results/real CSV are used.
+    Returns a DataFrame with one row per profile, sorted by wall time.
+    """
+    import json
+    import pandas as pd
+    from datetime import timedelta
+    from epochs import advance_record
+
+    profiles = profiles or list(PROFILES)
+    epoch_dates = [(start_date + timedelta(days=int(t))).date() for t in times]
+
+    objects = []
+    for name in targets:
+        json_path = os.path.join(data_dir, f"{name}.json")
+        real_path = os.path.join(real_dir, f"{name}_Real.csv")
+        if not (os.path.exists(json_path) and trajstore.exists(real_path)):
+            continue
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        el = {e['name']: float(e['value']) for e in data['orbit']['elements']}
+        el = advance_record(el, float(data['orbit']['epoch']), start_date)
+
+        real = trajstore.read_table(real_path)
+        real_dates = pd.to_datetime(real["datetime_str"].str.replace("A.D. ", "", regex=False)).dt.date
+        lookup = dict(zip(real_dates, real[["x", "y", "z"]].to_numpy()))
+        idx = [k for k, d in enumerate(epoch_dates) if d in lookup]
+        if not idx:
+            continue
+        objects.append((name, el, idx, np.array([lookup[epoch_dates[k]] for k in idx])))
+
+    rows = []
+    for profile in profiles:
+        errors = []
+        start = time.perf_counter()
+        for name, el, idx, real_xyz in objects:
+            states = propagate(el['a'], el['e'], el['i'], el['om'], el['w'], el['ma'], times,
+                               select_profile(profile, el))
+            errors.append(np.sqrt(np.mean(np.sum((states[idx, :3] - real_xyz) ** 2, axis=1))))
+        elapsed = time.perf_counter() - start
+
+        errors = np.array(errors)
+        rows.append({
+            "profile": profile,
+            "objects": len(objects),
+            "wall_time_s": elapsed,
+            "ms_per_object": 1000 * elapsed / max(len(objects), 1),
+            "median_rms_error_AU": np.median(errors) if len(errors) else np.nan,
+            "max_rms_error_AU": errors.max() if len(errors) else np.nan,
+        })
+
+    return pd.DataFrame(rows).sort_values("wall_time_s", ignore_index=True)
@@ -0,0 +1,233 @@
+"""Kepler-equation solver engine for the vectorized (CPU) propagation path.
+
+Solves E - e sin E = M for whole arrays. Starters:
+    markley   Markley (1995) cubic; good to ~1e-3 rad or better for every M and e < 1
+    danby     E = M + 0.85 e sign(sin M)
+    mean      E = M (the old solveE start)
+Iterations:
+    newton    second order
+    halley    third order
+    laguerre  Laguerre-Conway (n = 5), third order and robust as e -> 1
+
+On time grids (M shaped objects x epochs) each epoch is warm-started from
+the previous epoch's E, advanced by a second-order Taylor step in dM. The
+cold starter is used instead where the step is too large for the Taylor
+radius (near perihelion at high e). Only unconverged elements are iterated.
+Convergence is tested on the Newton error estimate |f / f'| at the current
+E; the next correction reuses it, so the test is free. Elements still
+unconverged after RESTART_AFTER corrections (Newton from E = M can cycle or
+run away at high e) restart from the Markley starter, whichever starter was
+chosen; any left after max_iter are reported with a warning. An iteration
+count is kept per element, and iteration_report turns these into per-object
+telemetry.
+
+Usage:
+    python src/kepler.py --limit 0
+    python src/cli.py kepler
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+
+STARTERS = ("markley", "danby", "mean")
+METHODS = ("newton", "halley", "laguerre")
+DEFAULT_TOL = 1e-12
+DEFAULT_MAX_ITER = 50
+WARM_MAX_STEP = 0.1         # warm start only where |dM| < this * (1 - e cos E)^2 / e
+RESTART_AFTER = 8           # a guess still unconverged after this many iterations restarts from the Markley starter
+WARM_MIN_OBJECTS = 64       # below this a grid is solved cold, vectorized over the epochs
+
+REPORT_FILE = "Kepler_Solver_Report.csv"
+REPORT_CONFIGS = {          # label -> (starter, method, warm)
+    "mean_newton": ("mean", "newton", False),
+    "danby_newton": ("danby", "newton", False),
+    "markley_halley": ("markley", "halley", False),
+    "warm_halley": ("markley", "halley", True),
+    "warm_laguerre": ("markley", "laguerre", True),
+}
+
+
+def reduce_anomaly(M):
+    """M wrapped to [-pi, pi)"""
+    return np.mod(M + np.pi, 2 * np.pi) - np.pi
+
+
+# -------------------- Starters / corrections --------------------
+def starter(M, e, kind="markley"):
+    """Initial E for reduced M (rad) and e < 1"""
+    if kind == "mean":
+        return np.array(M, dtype=float)
+    if kind == "danby":
+        return M + 0.85 * e * np.sign(np.sin(M))
+    if kind != "markley":
+        raise ValueError(f"Unknown starter '{kind}' (choose from {STARTERS})")
+
+    m = np.abs(M)
+    pi2 = np.pi * np.pi
+    alpha = (3.0 * pi2 + 1.6 * np.pi * (np.pi - m) / (1.0 + e)) / (pi2 - 6.0)
+    d = 3.0 * (1.0 - e) + alpha * e
+    q = 2.0 * alpha * d * (1.0 - e) - m * m
+    r = 3.0 * alpha * d * (d - 1.0 + e) * m + m ** 3
+    w = np.cbrt(np.abs(r) + np.sqrt(q ** 3 + r * r)) ** 2
+    denom = w * w + w * q + q * q
+    with np.errstate(invalid="ignore", divide="ignore"):
+        E = np.where(denom > 0, (2.0 * r * w / denom + m) / d, 0.0)
+    return np.sign(M) * E
+
+
+def _correction(method, f, f1, f2):
+    """Step to subtract from E given f = E - e sin E - M, f1 = f', f2 = f''"""
+    if method == "newton":
+        return f / f1
+    if method == "halley":
+        return f / (f1 - 0.5 * f * f2 / f1)
+    if method == "laguerre":
+        root = np.sqrt(np.abs(16.0 * f1 * f1 - 20.0 * f * f2))
+        return 5.0 * f / (f1 + np.where(f1 < 0, -root, root))
+    raise ValueError(f"Unknown method '{method}' (choose from {METHODS})")
+
+
+# -------------------- Solvers --------------------
+def _solve(M, e, E, method, tol, max_iter):
+    """Iterate E in place on flat arrays; returns (iterations, sin E, cos E) at the final E"""
+    iterations = np.zeros(M.size, dtype=np.int64)
+    sin_out, cos_out = np.empty(M.size), np.empty(M.size)
+    idx = np.arange(M.size)
+    for k in range(max_iter + 1):
+        Ea, ea = E[idx], e[idx]
+        sin_e, cos_e = np.sin(Ea), np.cos(Ea)
+        sin_out[idx], cos_out[idx] = sin_e, cos_e
+        f = Ea - ea * sin_e - M[idx]
+        f1 = 1.0 - ea * cos_e
+        todo = np.abs(f) >= tol * f1
+        if not todo.any():
+            break
+        if k == max_iter:
+            print(f"[WARNING] Kepler solver: {todo.sum()} of {M.size} elements unconverged after {max_iter} "
+                  f"iterations (max |E - e sin E - M| = {np.abs(f[todo]).max():.3g})")
+            break
+        if k == RESTART_AFTER:
+            idx = idx[todo]
+            E[idx] = starter(M[idx], e[idx], "markley")
+            continue
+        idx, Ea, f, f1, f2 = idx[todo], Ea[todo], f[todo], f1[todo], (ea * sin_e)[todo]
+        E[idx] = Ea - _correction(method, f, f1, f2)
+        iterations[idx] += 1
+    return iterations, sin_out, cos_out
+
+
+def solve(M, e, E0=None, method="halley", start="markley", tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER):
+    """(E, iterations) for arrays of mean anomaly M (rad) and e < 1.
+
+    E0 is an optional initial guess in the frame of the reduced M; otherwise
+    the starter is used. iterations counts the corrections applied per element.
+    """
+    M, e = np.broadcast_arrays(np.asarray(M, dtype=float), np.asarray(e, dtype=float))
+    shape = M.shape
+    M, e = reduce_anomaly(M).ravel(), e.ravel()
+    E = starter(M, e, start) if E0 is None else np.array(E0, dtype=float).ravel()
+    iterations, _, _ = _solve(M, e, E, method, tol, max_iter)
+    return E.reshape(shape), iterations.reshape(shape)
+
+
+def solve_grid(M, e, method="halley", start="markley", warm=True, tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER):
+    """(E, iterations), both (objects x epochs), for M shaped (objects x epochs) and e per object.
+
+    With warm=True each epoch starts from the previous one's E (see module
+    docstring); E is in the frame of the reduced M.
+    """
+    M = np.asarray(M, dtype=float)
+    e = np.asarray(e, dtype=float).reshape(-1)
+    if not warm or M.shape[1] < 2:
+        return solve(M, e[:, None], method=method, start=start, tol=tol, max_iter=max_iter)
+
+    Mr = reduce_anomaly(M)
+    E = np.empty_like(Mr)
+    iterations = np.empty(Mr.shape, dtype=np.int64)
+    E[:, 0] = starter(Mr[:, 0], e, start)
+    column = np.ascontiguousarray(E[:, 0])
+    iterations[:, 0], sin_e, cos_e = _solve(Mr[:, 0], e, column, method, tol, max_iter)
+    E[:, 0] = column
+    for k in range(1, Mr.shape[1]):
+        # sin / cos of the previous E come back from its solve, so the predictor is nearly free
+        prev = E[:, k - 1]
+        f1 = 1.0 - e * cos_e
+        dM = reduce_anomaly(Mr[:, k] - Mr[:, k - 1])
+        guess = prev + dM / f1 - 0.5 * dM * dM * e * sin_e / f1 ** 3
+        # Keep the guess in the frame of the reduced M (the shift is a whole number of revolutions)
+        guess += Mr[:, k] - (Mr[:, k - 1] + dM)
+        cold = np.abs(dM) * e > WARM_MAX_STEP * f1 * f1
+        if cold.any():
+            guess[cold] = starter(Mr[cold, k], e[cold], start)
+        iterations[:, k], sin_e, cos_e = _solve(np.ascontiguousarray(Mr[:, k]), e, guess, method, tol, max_iter)
+        E[:, k] = guess
+    return E, iterations
+
+
+# -------------------- Telemetry --------------------
+def iteration_report(names, ma0, n, e, times, configs=None):
+    """Per-object mean / max iterations for each solver configuration over a time grid.
+
+    ma0 (deg) and n (deg/day) are per object; times in days. Returns
+    (per-object DataFrame, per-config DataFrame with wall time and averages).
+    """
+    import pandas as pd
+
+    configs = configs or REPORT_CONFIGS
+    M = np.radians(np.asarray(ma0, dtype=float)[:, None] + np.asarray(n, dtype=float)[:, None] * np.asarray(times)[None, :])
+    e = np.asarray(e, dtype=float)
+    per_object = pd.DataFrame({"object": names, "e": e})
+    totals = []
+    for label, (start, method, warm) in configs.items():
+        t0 = time.perf_counter()
+        E, iterations = solve_grid(M, e, method, start, warm)
+        wall = time.perf_counter() - t0
+        residual = np.abs(reduce_anomaly(E - e[:, None] * np.sin(E) - M))
+
+        per_object[f"{label}_mean"] = iterations.mean(axis=1)
+        per_object[f"{label}_max"] = iterations.max(axis=1)
+        high = e >= 0.5
+        totals.append({
+            "config": label,
+            "wall_time_s": wall,
+            "mean_iterations": iterations.mean(),
+            "mean_iterations_e>=0.5": iterations[high].mean() if high.any() else np.nan,
+            "max_iterations": int(iterations.max()),
+            "max_residual": residual.max() if residual.size else 0.0,
+        })
+    return per_object, pd.DataFrame(totals)
+
+
+def run(names, data_dir="data", output_dir=os.path.join("results", "analysis", "unified")):
+    from elements import MU_SUN, load_catalog
+    from rebound_check import times
+
+    found, columns = load_catalog(names, data_dir)
+    bound = columns["e"] < 1.0
+    if not bound.any():
+        raise ValueError("No elliptic objects with element files found")
+    n = np.degrees(np.sqrt(MU_SUN / columns["a"][bound] ** 3))
+    per_object, totals = iteration_report([f for f, b in zip(found, bound) if b], columns["ma"][bound], n,
+                                          columns["e"][bound], times)
+
+    os.makedirs(output_dir, exist_ok=True)
+    out = os.path.join(output_dir, REPORT_FILE)
+    per_object.to_csv(out, index=False)
+    print(f"[INFO] {len(per_object)} objects x {len(times)} epochs")
+    print(totals.to_string(index=False))
+    print(f"Per-object iteration counts saved to: {out}")
+    return per_object, totals
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=100, help="first N targets (0 = all)")
+    args = parser.parse_args()
+
+    run(read_targets(args.targets, args.limit), args.data_dir)
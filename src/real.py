@@ -4,86 +4,99 @@ import sys
 sys.stdout.reconfigure(encoding='utf-8')
 
 import os
-import numpy as np
-import matplotlib.pyplot as plt
-from astroquery.jplhorizons import Horizons
 
-# ---------- Read targets ----------
-targets_file = r"C:/Users/JASMINE/Desktop/RnD_asteroid/targets_english.txt"
+# ---------- Output directory ----------
+output_dir = os.path.join("results", "real")
 
-asteroids = []
+# ---------- 20 YEAR RANGE ----------
+START_DATE = '2025-01-01'
+END_DATE   = '2045-01-01'
+STEP       = '5d'
 
-with open(targets_file, "r", encoding="utf-8") as f:
-    for line in f:
-        name = line.strip()
-        if name:
-            asteroids.append(name)
 
-# ✅ LIMIT TO FIRST 100 ASTEROIDS
-asteroids = asteroids[:100]
+def read_targets(targets_file, limit=100):
+    """Target names, one per line"""
+    asteroids = []
 
-print(f"[INFO] Using {len(asteroids)} asteroids (first 100)")
+    with open(targets_file, "r", encoding="utf-8") as f:
+        for line in f:
+            name = line.strip()
+            if name:
+                asteroids.append(name)
 
-# ---------- Output directory ----------
-output_dir = os.path.join("results", "real")
-os.makedirs(output_dir, exist_ok=True)
+    return asteroids[:limit] if limit else asteroids
 
-# ---------- Plot setup ----------
-fig = plt.figure(figsize=(10, 8), facecolor='black')
-ax = fig.add_subplot(111, projection='3d', facecolor='black')
 
-ax.scatter(0, 0, 0, color='yellow', s=300, label='Sun')
+def fetch_real(targets_file="targets_english.txt", output_dir=output_dir, limit=100, plot=True):
+    """Download heliocentric Horizons vectors for each target into output_dir"""
+    from astroquery.jplhorizons import Horizons
 
-# ---------- 20 YEAR RANGE ----------
-START_DATE = '2025-01-01'
-END_DATE   = '2045-01-01'
-STEP       = '5d'
+    asteroids = read_targets(targets_file, limit)
+
+    print(f"[INFO] Using {len(asteroids)} asteroids" + (f" (first {limit})" if limit else ""))
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # ---------- Plot setup ----------
+    if plot:
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(10, 8), facecolor='black')
+        ax = fig.add_subplot(111, projection='3d', facecolor='black')
+
+        ax.scatter(0, 0, 0, color='yellow', s=300, label='Sun')
+
+    # ---------- Fetch Data ----------
+    for name in asteroids:
+        try:
+            print(f"\nFetching orbit for {name} (20 years)...")
+
+            number = name.split()[0]
+            id_code = number + ";"
 
-# ---------- Fetch Data ----------
-for name in asteroids:
-    try:
-        print(f"\nFetching orbit for {name} (20 years)...")
+            obj = Horizons(
+                id=id_code,
+                location='@sun',
+                epochs={
+                    'start': START_DATE,
+                    'stop': END_DATE,
+                    'step': STEP
+                }
+            )
 
-        number = name.split()[0]
-        id_code = number + ";"
+            vectors = obj.vectors()
 
-        obj = Horizons(
-            id=id_code,
-            location='@sun',
-            epochs={
-                'start': START_DATE,
-                'stop': END_DATE,
-                'step': STEP
-            }
-        )
+            df = vectors.to_pandas()[[
+                'datetime_str', 'x', 'y', 'z', 'vx', 'vy', 'vz'
+            ]]
 
-        vectors = obj.vectors()
+            safe_name = name.replace(" ", "_")
+            filename = os.path.join(output_dir, f"{safe_name}_Real.csv")
+            df.to_csv(filename, index=False)
 
-        df = vectors.to_pandas()[[
-            'datetime_str', 'x', 'y', 'z', 'vx', 'vy', 'vz'
-        ]]
+            print(f"Saved: {filename}")
 
-        safe_name = name.replace(" ", "_")
-        filename = os.path.join(output_dir, f"{safe_name}_Real.csv")
-        df.to_csv(filename, index=False)
+            # Plot trajectory
+            if plot:
+                ax.plot(df['x'], df['y'], df['z'], lw=0.8)
 
-        print(f"Saved: {filename}")
+        except Exception as e:
+            print(f"[ERROR] Could not fetch {name}: {e}")
 
-        # Plot trajectory
-        ax.plot(df['x'], df['y'], df['z'], lw=0.8)
+    # ---------- Plot Styling ----------
+    if plot:
+        ax.set_xlabel('X [AU]', color='white')
+        ax.set_ylabel('Y [AU]', color='white')
+        ax.set_zlabel('Z [AU]', color='white')
+        ax.tick_params(colors='white')
+        ax.set_title('Asteroid Orbits (2005–2025) — NASA JPL Horizons', color='white')
 
-    except Exception as e:
-        print(f"[ERROR] Could not fetch {name}: {e}")
+        ax.view_init(elev=25, azim=45)
 
-# ---------- Plot Styling ----------
-ax.set_xlabel('X [AU]', color='white')
-ax.set_ylabel('Y [AU]', color='white')
-ax.set_zlabel('Z [AU]', color='white')
-ax.tick_params(colors='white')
-ax.set_title('Asteroid Orbits (2005–2025) — NASA JPL Horizons', color='white')
+        plt.show()
 
-ax.view_init(elev=25, azim=45)
+    print("\n✅ 20-year real ephemeris data generation complete.")
 
-plt.show()
 
-print("\n✅ 20-year real ephemeris data generation complete.")
\ No newline at end of file
+if __name__ == "__main__":
+    fetch_real()
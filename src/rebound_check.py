@@ -4,12 +4,13 @@ import os
 import json
 import numpy as np
 import pandas as pd
-import rebound
 from datetime import datetime, timedelta
 
+from epochs import advance_record
+from integrators import propagate, select_profile
+
 # -------------------- Output directory --------------------
 output_dir = os.path.join("results", "rebound")
-os.makedirs(output_dir, exist_ok=True)
 
 # -------------------- Planet orbital elements --------------------
 planets = {
@@ -20,22 +21,6 @@ planets = {
     'Jupiter': {'a': 5.204, 'e': 0.049, 'i': 1.3,  'om': 100.6,'w': 273.9, 'ma': 20.0}
 }
 
-# -------------------- Read asteroid targets --------------------
-targets_file = r"C:/Users/JASMINE/Desktop/RnD_asteroid/targets_english.txt"
-
-asteroids = []
-with open(targets_file, "r", encoding="utf-8") as f:
-    for line in f:
-        name = line.strip()
-        if name:
-            name = name.replace(" ", "_")
-            asteroids.append(name)
-
-# Limit to first 100 asteroids
-asteroids = asteroids[:100]
-
-print(f"[INFO] Running simulation for {len(asteroids)} asteroids (20 years)")
-
 # -------------------- Time setup (20 years) --------------------
 start_date = datetime(2025, 1, 1)
 end_date = datetime(2044, 12, 31)  # 20 years
@@ -47,39 +32,36 @@ times = np.arange(
     delta_days
 )
 
-print(f"[INFO] Total timesteps per object: {len(times)}")
+# -------------------- Read asteroid targets --------------------
+def read_targets(targets_file, limit=100):
+    """Target names with spaces replaced by underscores (data/ file stems)"""
+    asteroids = []
+    with open(targets_file, "r", encoding="utf-8") as f:
+        for line in f:
+            name = line.strip()
+            if name:
+                name = name.replace(" ", "_")
+                asteroids.append(name)
+    return asteroids[:limit] if limit else asteroids
 
 # -------------------- Simulation Function --------------------
-def simulate_and_save(name, a, e, i, om, w, ma):
-
-    sim = rebound.Simulation()
-    sim.units = ('AU', 'day', 'Msun')
-    sim.add(m=1.0)  # Sun
-    sim.add(
-        a=a,
-        e=e,
-        inc=np.radians(i),
-        Omega=np.radians(om),
-        omega=np.radians(w),
-        M=np.radians(ma)
-    )
-    sim.move_to_com()
+def simulate_and_save(name, a, e, i, om, w, ma, output_dir=output_dir, profile="ias15"):
 
-    data = []
+    profile = select_profile(profile, {'a': a, 'e': e})
+    states = propagate(a, e, i, om, w, ma, times, profile)
 
-    for t in times:
-        sim.integrate(t)
-        p = sim.particles[1]
+    data = []
 
+    for t, (x, y, z, vx, vy, vz) in zip(times, states):
         current_date = start_date + timedelta(days=int(t))
         datetime_str = current_date.strftime("A.D. %Y-%b-%d 00:00:00.0000")
 
-        r = np.sqrt(p.x**2 + p.y**2 + p.z**2)
+        r = np.sqrt(x**2 + y**2 + z**2)
 
         data.append([
             datetime_str,
-            p.x, p.y, p.z,
-            p.vx, p.vy, p.vz,
+            x, y, z,
+            vx, vy, vz,
             r
         ])
 
@@ -91,26 +73,24 @@ def simulate_and_save(name, a, e, i, om, w, ma):
     csv_path = os.path.join(output_dir, f"{name}_Rebound.csv")
     df.to_csv(csv_path, index=False)
 
-    print(f"{name:<25} — Saved")
-
-# -------------------- Run Planet Simulations --------------------
-for name, el in planets.items():
-    simulate_and_save(name, **el)
+    print(f"{name:<25} — Saved ({profile})")
 
-# -------------------- Run Asteroid Simulations --------------------
-for asteroid in asteroids:
-
-    file_path = os.path.join("data", f"{asteroid}.json")
+# -------------------- Run --------------------
+def simulate_target(asteroid, data_dir="data", output_dir=output_dir, profile="ias15"):
+    """Simulate one target from its JSON in data_dir; returns False if it was skipped or failed"""
+    file_path = os.path.join(data_dir, f"{asteroid}.json")
 
     if not os.path.exists(file_path):
         print(f"[WARNING] Skipping {asteroid}: JSON file not found.")
-        continue
+        return False
 
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
         el = {e['name']: float(e['value']) for e in data['orbit']['elements']}
+        # SBDB elements are osculating at their own epoch; start everything at start_date
+        el = advance_record(el, float(data['orbit']['epoch']), start_date)
 
         simulate_and_save(
             asteroid,
@@ -119,11 +99,38 @@ for asteroid in asteroids:
             i=el['i'],
             om=el['om'],
             w=el['w'],
-            ma=el['ma']
+            ma=el['ma'],
+            output_dir=output_dir,
+            profile=profile
         )
+        return True
 
     except Exception as e:
         print(f"[ERROR] Failed to simulate {asteroid}: {e}")
+        return False
+
+
+def simulate_planets(output_dir=output_dir, profile="ias15"):
+    for name, el in planets.items():
+        simulate_and_save(name, **el, output_dir=output_dir, profile=profile)
+
+
+def run(targets_file="targets_english.txt", data_dir="data", output_dir=output_dir, limit=100, profile="ias15"):
+    """Simulate the planets and every target with a JSON file in data_dir using an integrator profile"""
+    os.makedirs(output_dir, exist_ok=True)
+    asteroids = read_targets(targets_file, limit)
+
+    print(f"[INFO] Running simulation for {len(asteroids)} asteroids (20 years)")
+    print(f"[INFO] Total timesteps per object: {len(times)}")
+
+    simulate_planets(output_dir, profile)
+
+    for asteroid in asteroids:
+        simulate_target(asteroid, data_dir, output_dir, profile)
+
+    print("\n20-year Rebound simulations complete.")
+    print(f"Results saved in {output_dir}/")
+
 
-print("\n20-year Rebound simulations complete.")
-print("Results saved in results/rebound_20yr/")
\ No newline at end of file
+if __name__ == "__main__":
+    run()
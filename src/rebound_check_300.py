@@ -3,6 +3,8 @@ import json
 import numpy as np
 import matplotlib.pyplot as plt
 
+from elements import catalog_columns, elements_to_state, add_states
+
 with open("targets.txt", "r", encoding="utf-8") as f:
     asteroid_names = [line.strip() for line in f.readlines()[:10]]
 
@@ -33,17 +35,15 @@ for name in asteroid_names:
         with open(file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
         el = {e['name']: float(e['value']) for e in data['orbit']['elements']}
-        sim.add(
-            a=el['a'], e=el['e'],
-            inc=np.radians(el['i']),
-            Omega=np.radians(el['om']),
-            omega=np.radians(el['w']),
-            M=np.radians(el['ma'])
-        )
         asteroids.append({'name': name, 'elements': el})
     except Exception as e:
         print(f"Error loading {name}: {e}")
 
+# Convert all asteroid elements at once and seed them in bulk
+if asteroids:
+    columns = catalog_columns([a['elements'] for a in asteroids])
+    add_states(sim, elements_to_state(**columns))
+
 sim.move_to_com()
 
 N = 1500
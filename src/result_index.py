@@ -0,0 +1,268 @@
+"""SQLite index over the catalog, the unified summary, events and trajectory files.
+
+One file (results/index.sqlite by default) holds:
+    catalog   elements, physical parameters, family and orbit class per catalog row
+    summary   the unified comparison summary (columns follow the CSV)
+    events    the in-integration event table (Events.csv)
+    paths     per object: where its real / rebound / manual / clones / detailed tables are
+              (a CSV or a trajectory store member; both open with trajstore.read_table)
+    objects   all of the above joined on the object's identity key, one row per object
+
+Objects are matched to catalog rows by the same identity keys as
+validate_targets ('#433', '2023 DW', 'name:ceres'), so '433_Eros' joins
+'433 Eros (A898 PA)'. Each source is re-read only when its signature
+(mtime and size, or directory mtime) changed, so an update after a stage
+costs a few stat calls plus whatever actually changed; the joined objects
+table is then rebuilt inside SQLite, so queries are a single indexed table
+scan. The CLI refreshes an existing index after every stage that writes
+results.
+
+Usage:
+    python src/result_index.py --update
+    python src/result_index.py "orbit_class = 'Apollo' AND rebound_rms_error > 1e-3"
+    python src/cli.py find "orbit_class = 'Apollo'" --columns object,rebound_rms_error,detailed_path
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+
+import trajstore
+from validate_targets import catalog_keys, clean_line, parse_entry
+
+INDEX_FILE = os.path.join("results", "index.sqlite")
+SUMMARY_FILE = "Unified_Model_Comparison_Advanced.csv"
+EVENTS_FILE = "Events.csv"
+
+CATALOG_ORBIT = ["a", "e", "i", "q", "ad", "om", "w", "ma", "per"]
+CATALOG_PHYS = ["diameter", "albedo", "rot_per"]
+PATH_KINDS = {      # kind -> (config directory key, file suffix)
+    "real": ("real_dir", "_Real.csv"),
+    "rebound": ("rebound_dir", "_Rebound.csv"),
+    "manual": ("manual_dir", ".csv"),
+    "clones": ("clones_dir", "_Clones.csv"),
+    "detailed": ("analysis_dir", "_Detailed_Comparison.csv"),
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sources (source TEXT PRIMARY KEY, signature TEXT);
+CREATE TABLE IF NOT EXISTS catalog (key TEXT PRIMARY KEY, name TEXT, orbit_class TEXT, family TEXT,
+    {", ".join(f"{c} REAL" for c in CATALOG_ORBIT + CATALOG_PHYS)});
+CREATE INDEX IF NOT EXISTS catalog_class ON catalog (orbit_class);
+CREATE TABLE IF NOT EXISTS paths (object TEXT PRIMARY KEY, key TEXT,
+    {", ".join(f"{kind}_path TEXT" for kind in PATH_KINDS)});
+CREATE INDEX IF NOT EXISTS paths_key ON paths (key);
+CREATE TABLE IF NOT EXISTS summary (object TEXT PRIMARY KEY, key TEXT);
+CREATE TABLE IF NOT EXISTS events (object TEXT, key TEXT);
+"""
+
+
+# -------------------- Keys and classes --------------------
+def object_key(stem):
+    """Identity key of a results file stem ('433_Eros' -> '#433')"""
+    return parse_entry(clean_line(stem.replace("_", " ")))[0]
+
+
+def catalog_key(full_name):
+    """Identity key of a catalog name ('433 Eros (A898 PA)' -> '#433', '(2023 DW)' -> '2023 DW', '1P/Halley' -> '1P')"""
+    keys = catalog_keys(full_name)
+    return keys[0] if keys else None
+
+
+def orbit_class(a, e, q=None):
+    """JPL-style orbit class from a (AU), e and optionally q"""
+    if a is None or e is None:
+        return None
+    if e > 1:
+        return "Hyperbolic"
+    if e == 1:
+        return "Parabolic"
+    q = a * (1 - e) if q is None else q
+    Q = a * (1 + e)
+    if a < 1.0:
+        return "Atira" if Q < 0.983 else "Aten"
+    if q < 1.017:
+        return "Apollo"
+    if q < 1.3:
+        return "Amor"
+    if q < 1.666 and a < 3.2:
+        return "Mars-crosser"
+    if a < 2.0:
+        return "Inner Main-belt"
+    if a < 3.2:
+        return "Main-belt"
+    if a < 4.6:
+        return "Outer Main-belt"
+    if a < 5.5:
+        return "Jupiter Trojan" if e < 0.3 else "Other"
+    if a < 30.1:
+        return "Centaur"
+    return "TNO"
+
+
+# -------------------- Sources --------------------
+def _signature(path):
+    """mtime/size of a file, or mtime of a directory and its store; None if missing"""
+    if os.path.isdir(path):
+        store = trajstore.store_path(path)
+        parts = [os.stat(path).st_mtime_ns]
+        if os.path.exists(store):
+            parts += [os.stat(store).st_mtime_ns, os.path.getsize(store)]
+        return ":".join(map(str, parts))
+    if os.path.exists(path):
+        st = os.stat(path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    return None
+
+
+def _changed(con, source, path, rebuild):
+    signature = _signature(path)
+    old = con.execute("SELECT signature FROM sources WHERE source = ?", (source,)).fetchone()
+    if not rebuild and old is not None and old[0] == signature:
+        return False
+    con.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (source, signature))
+    return True
+
+
+def _load_catalog(con, catalog_file):
+    con.execute("DELETE FROM catalog")
+    if not os.path.exists(catalog_file):
+        return 0
+    with open(catalog_file, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+
+    rows = []
+    for row in catalog:
+        key = catalog_key(row.get("name", ""))
+        if key is None:
+            continue
+        orbit, phys = row.get("orbit", {}), row.get("phys") or {}
+        rows.append([key, row["name"], orbit_class(orbit.get("a"), orbit.get("e"), orbit.get("q")), row.get("family")]
+                    + [orbit.get(c) for c in CATALOG_ORBIT] + [phys.get(c) for c in CATALOG_PHYS])
+    columns = 4 + len(CATALOG_ORBIT) + len(CATALOG_PHYS)
+    con.executemany(f"INSERT OR REPLACE INTO catalog VALUES ({', '.join('?' * columns)})", rows)
+    return len(rows)
+
+
+def _load_paths(con, kind, directory, suffix):
+    col = f"{kind}_path"
+    con.execute(f"UPDATE paths SET {col} = NULL")
+    rows = []
+    for path in trajstore.list_tables(directory, suffix):
+        stem = os.path.basename(path)[:-len(suffix)]
+        rows.append((stem, object_key(stem), path))
+    con.executemany(f"INSERT INTO paths (object, key, {col}) VALUES (?, ?, ?) "
+                    f"ON CONFLICT (object) DO UPDATE SET {col} = excluded.{col}", rows)
+    con.execute(f"DELETE FROM paths WHERE {' AND '.join(f'{k}_path IS NULL' for k in PATH_KINDS)}")
+    return len(rows)
+
+
+def _load_table(con, table, csv_path):
+    """Replace table with the CSV (plus a key column); an empty table if the CSV is missing"""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path) if os.path.exists(csv_path) else pd.DataFrame(columns=["object"])
+    df.insert(1, "key", [object_key(name) for name in df["object"]])
+    con.execute(f"DROP TABLE IF EXISTS {table}")
+    df.to_sql(table, con, index=False)
+    con.execute(f"CREATE INDEX {table}_object ON {table} (object)")
+    con.execute(f"CREATE INDEX {table}_key ON {table} (key)")
+    return len(df)
+
+
+def _build_objects(con):
+    """Materialize the joined objects table (rebuilt whenever a source changed)"""
+    summary = [r[1] for r in con.execute("PRAGMA table_info(summary)") if r[1] not in ("object", "key")]
+    catalog = ["name AS catalog_name", "orbit_class", "family"] + CATALOG_ORBIT + CATALOG_PHYS
+    con.execute("DROP TABLE IF EXISTS objects")
+    con.execute(f"""
+        CREATE TABLE objects AS
+        SELECT o.object, o.key, {", ".join(f"c.{c}" for c in catalog)}
+            {"".join(f', s."{c}"' for c in summary)}
+            {"".join(f", p.{kind}_path" for kind in PATH_KINDS)}
+        FROM (SELECT object, key FROM paths UNION SELECT object, key FROM summary) o
+        LEFT JOIN catalog c ON c.key = o.key
+        LEFT JOIN summary s ON s.object = o.object
+        LEFT JOIN paths p ON p.object = o.object
+    """)
+    con.execute("CREATE UNIQUE INDEX objects_object ON objects (object)")
+    con.execute("CREATE INDEX objects_key ON objects (key)")
+    con.execute("CREATE INDEX objects_class ON objects (orbit_class)")
+
+
+# -------------------- Update / query --------------------
+def connect(index_file=INDEX_FILE):
+    os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+    con = sqlite3.connect(index_file, timeout=60)
+    con.executescript(SCHEMA)
+    return con
+
+
+def update_index(index_file=INDEX_FILE, catalog_file="asteroids_master.json", dirs=None,
+                 summary_file=SUMMARY_FILE, rebuild=False, verbose=True):
+    """Re-read every changed source into the index; dirs maps config keys (real_dir, ...) to paths.
+    Returns {source: rows} for the sources that were reloaded."""
+    from config import DEFAULTS
+
+    dirs = {key: (dirs or {}).get(key, DEFAULTS[key]) for key, _ in PATH_KINDS.values()}
+    analysis_dir = dirs["analysis_dir"]
+    updated = {}
+    con = connect(index_file)
+    with con:
+        if _changed(con, "catalog", catalog_file, rebuild):
+            updated["catalog"] = _load_catalog(con, catalog_file)
+        for kind, (dir_key, suffix) in PATH_KINDS.items():
+            if _changed(con, kind, dirs[dir_key], rebuild):
+                updated[kind] = _load_paths(con, kind, dirs[dir_key], suffix)
+        if _changed(con, "summary", os.path.join(analysis_dir, summary_file), rebuild):
+            updated["summary"] = _load_table(con, "summary", os.path.join(analysis_dir, summary_file))
+        if _changed(con, "events", os.path.join(analysis_dir, EVENTS_FILE), rebuild):
+            updated["events"] = _load_table(con, "events", os.path.join(analysis_dir, EVENTS_FILE))
+        if updated or con.execute("SELECT 1 FROM sqlite_master WHERE name = 'objects'").fetchone() is None:
+            _build_objects(con)
+    con.close()
+
+    if verbose:
+        changes = ", ".join(f"{source}: {n}" for source, n in updated.items()) or "up to date"
+        print(f"[INFO] Index {index_file}: {changes}")
+    return updated
+
+
+def query(index_file=INDEX_FILE, where=None, columns=None, order_by=None, limit=None, sql=None):
+    """DataFrame of objects rows matching an SQL WHERE clause (or the result of a full SQL query)"""
+    import pandas as pd
+
+    if not os.path.exists(index_file):
+        raise FileNotFoundError(f"Index not found: {index_file} (build it with 'cli.py index')")
+    if sql is None:
+        sql = f"SELECT {', '.join(columns) if columns else '*'} FROM objects"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+    with sqlite3.connect(index_file) as con:
+        return pd.read_sql_query(sql, con)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("where", nargs="?", default=None, help="SQL condition on the objects table")
+    parser.add_argument("--index", default=INDEX_FILE)
+    parser.add_argument("--catalog", default="asteroids_master.json")
+    parser.add_argument("--update", action="store_true", help="refresh the index first")
+    parser.add_argument("--rebuild", action="store_true", help="re-read every source")
+    parser.add_argument("--columns", default=None, help="comma-separated columns (default: all)")
+    parser.add_argument("--order-by", default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.update or args.rebuild or not os.path.exists(args.index):
+        update_index(args.index, args.catalog, rebuild=args.rebuild)
+    if args.where is not None or not (args.update or args.rebuild):
+        table = query(args.index, args.where, args.columns.split(",") if args.columns else None,
+                      args.order_by, args.limit)
+        print(table.to_string(index=False))
+        print(f"\n{len(table)} objects")
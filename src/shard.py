@@ -0,0 +1,330 @@
+"""Deterministic sharding and a shared-filesystem work queue for multi-node runs.
+
+Static mode (--shard k/N, k = 0..N-1) gives every node a fixed slice of the
+target list. Objects are assigned by a CRC32 of their normalized name, so the
+split is identical on every machine and stable when targets are appended.
+
+Queue mode (--queue DIR on a shared mount such as NFS) adds lease files on
+top: a node first claims the objects of its own shard, then steals any
+unclaimed or expired objects from other shards, so idle nodes pick up what is
+left. A claim is an O_CREAT|O_EXCL create of <DIR>/<stage>/leases/<name>
+holding the worker's owner token. Finished objects get a marker in
+<DIR>/<stage>/done/. While an object is being processed a heartbeat thread
+touches its lease every lease_seconds / 4. A lease that has not been touched
+for lease_seconds is considered abandoned and can be taken over. A takeover
+puts back a lease that turns out to be fresh and re-reads the new lease after
+TAKEOVER_SETTLE seconds, so two workers racing for the same abandoned lease
+cannot both keep it. No external services are involved.
+
+Each node writes per-object outputs to the shared result directories as
+usual. The compare stage appends each object's row to a per-worker summary
+part file before marking it done, and merge_summaries() joins the parts into
+the unified summary (a rerun's repeated rows are dropped, last one wins).
+"""
+
+import os
+import glob
+import time
+import socket
+import zlib
+import threading
+
+LEASE_SECONDS = 600
+TAKEOVER_SETTLE = 1.0       # seconds to wait before re-reading a lease taken over from another worker
+PART_PREFIX = "part-"
+
+
+# -------------------- Static sharding --------------------
+def parse_shard(spec):
+    """'k/N' -> (k, N) with 0 <= k < N"""
+    try:
+        k, n = (int(v) for v in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like k/N, got '{spec}'")
+    if n < 1 or not 0 <= k < n:
+        raise ValueError(f"Shard index must satisfy 0 <= k < N, got '{spec}'")
+    return k, n
+
+
+def shard_of(name, n):
+    """Shard index of an object; spaces and underscores are treated alike"""
+    key = name.replace("_", " ").strip().lower().encode("utf-8")
+    return zlib.crc32(key) % n
+
+
+def shard_targets(targets, k, n):
+    return [t for t in targets if shard_of(t, n) == k]
+
+
+# -------------------- Lease queue --------------------
+def _safe(name):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+class LeaseQueue:
+    """File-based work queue for one pipeline stage on a shared filesystem"""
+
+    def __init__(self, queue_dir, stage, worker=None, lease_seconds=LEASE_SECONDS):
+        self.worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+        # Unique even when several processes are started with the same --worker name
+        self.token = f"{self.worker}:{os.urandom(4).hex()}"
+        self.lease_seconds = lease_seconds
+        self.lease_dir = os.path.join(queue_dir, stage, "leases")
+        self.done_dir = os.path.join(queue_dir, stage, "done")
+        os.makedirs(self.lease_dir, exist_ok=True)
+        os.makedirs(self.done_dir, exist_ok=True)
+
+    def _lease_path(self, name):
+        return os.path.join(self.lease_dir, _safe(name))
+
+    def is_done(self, name):
+        return os.path.exists(os.path.join(self.done_dir, _safe(name)))
+
+    def claim(self, name):
+        """Try to take the lease on name; True if this worker now owns it"""
+        if self.is_done(name):
+            return False
+        path = self._lease_path(name)
+        took_over = False
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._expired(path) or not self._take_over(path):
+                return False
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+            took_over = True
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{self.token} {time.time():.0f}\n")
+        if took_over:
+            # A worker that judged the old lease stale at the same time may still move ours away
+            time.sleep(TAKEOVER_SETTLE)
+            return self.owns(name)
+        return True
+
+    def _take_over(self, path):
+        """Remove an abandoned lease; False if it was not ours to remove"""
+        stale = f"{path}.stale-{self.token.replace(':', '-')}"
+        try:
+            os.rename(path, stale)
+        except FileNotFoundError:
+            return False
+        if not self._expired(stale):
+            # We moved a lease that was re-created or renewed after our check: put it back
+            try:
+                os.link(stale, path)
+            except FileExistsError:
+                pass
+            os.remove(stale)
+            return False
+        os.remove(stale)
+        return True
+
+    def owns(self, name):
+        """True if the lease on name holds this worker's token"""
+        try:
+            with open(self._lease_path(name), "r", encoding="utf-8") as f:
+                return f.readline().split(" ")[0] == self.token
+        except FileNotFoundError:
+            return False
+
+    def _expired(self, path):
+        try:
+            return time.time() - os.path.getmtime(path) > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def renew(self, name):
+        """Touch the lease on name; False if it is no longer ours"""
+        if not self.owns(name):
+            return False
+        try:
+            os.utime(self._lease_path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def heartbeat(self, name):
+        """Renew the lease on name every lease_seconds / 4 from a daemon thread; returns a stop function"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.lease_seconds / 4):
+                if not self.renew(name):
+                    print(f"[WARNING] Lost the lease on {name} to another worker")
+                    return
+
+        threading.Thread(target=beat, daemon=True).start()
+        return stop.set
+
+    def complete(self, name):
+        """Mark name done and drop its lease"""
+        with open(os.path.join(self.done_dir, _safe(name)), "w") as f:
+            f.write(f"{self.worker} {time.time():.0f}\n")
+        try:
+            os.remove(self._lease_path(name))
+        except FileNotFoundError:
+            pass
+
+    def release(self, name):
+        """Give a lease back without completing it (e.g. after a failure); a lease taken over by
+        another worker is left alone"""
+        if not self.owns(name):
+            return
+        try:
+            os.remove(self._lease_path(name))
+        except FileNotFoundError:
+            pass
+
+    def work(self, targets, shard=None):
+        """Yield targets this worker has claimed: own shard first, then the rest"""
+        if shard is not None:
+            k, n = shard
+            own = [t for t in targets if shard_of(t, n) == k]
+            rest = [t for t in targets if shard_of(t, n) != k]
+            ordered = own + rest
+        else:
+            ordered = list(targets)
+        for target in ordered:
+            if self.claim(target):
+                yield target
+
+
+# -------------------- Driver --------------------
+def iter_assigned(targets, stage, shard=None, queue_dir=None, worker=None):
+    """Yield (target, done_callback) for the objects this node should process.
+
+    Without queue_dir only the static shard is used; the callback then does
+    nothing. With queue_dir the callback marks the object done (ok=True) or
+    releases the lease so another node can retry it (ok=False).
+    """
+    if queue_dir is None:
+        selected = shard_targets(targets, *shard) if shard else targets
+        for target in selected:
+            yield target, (lambda ok=True: None)
+        return
+
+    q = LeaseQueue(queue_dir, stage, worker)
+    for target in q.work(targets, shard):
+        stop = q.heartbeat(target)
+
+        def done(ok=True, target=target, stop=stop):
+            stop()
+            if ok:
+                q.complete(target)
+            else:
+                q.release(target)
+        try:
+            yield target, done
+        finally:
+            stop()
+
+
+# -------------------- Stages --------------------
+def fetch_shard(targets, data_dir, shard=None, queue_dir=None, worker=None):
+    """Fetch this node's share of the targets into data_dir"""
+    from api_Test import fetch_all
+
+    fetched = 0
+    for target, done in iter_assigned(targets, "fetch", shard, queue_dir, worker):
+        success, errors = fetch_all([target], data_dir)
+        done(ok=not errors)
+        fetched += success
+    print(f"[INFO] Fetch shard finished: {fetched} objects")
+    return fetched
+
+
+def simulate_shard(targets, data_dir, output_dir, profile="ias15", shard=None, queue_dir=None, worker=None):
+    """Simulate this node's share of the targets; the planets go with shard 0 (or the queue)"""
+    from rebound_check import simulate_target, simulate_planets
+
+    os.makedirs(output_dir, exist_ok=True)
+    if queue_dir is not None:
+        q = LeaseQueue(queue_dir, "simulate", worker)
+        if q.claim("__planets__"):
+            stop = q.heartbeat("__planets__")
+            try:
+                simulate_planets(output_dir, profile)
+            finally:
+                stop()
+            q.complete("__planets__")
+    elif shard is None or shard[0] == 0:
+        simulate_planets(output_dir, profile)
+
+    simulated = 0
+    for target, done in iter_assigned(targets, "simulate", shard, queue_dir, worker):
+        ok = simulate_target(target, data_dir, output_dir, profile)
+        done(ok=ok)
+        simulated += ok
+    print(f"[INFO] Simulate shard finished: {simulated} objects")
+    return simulated
+
+
+def compare_shard(targets, real_dir, rebound_dir, manual_dir, output_dir,
+                  summary_file="Unified_Model_Comparison_Advanced.csv", shard=None, queue_dir=None, worker=None):
+    """Compare this node's share of the objects, appending each summary row to a part file for merge_summaries()"""
+    import pandas as pd
+    from _rebound import compare_object, build_summary
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem, ext = os.path.splitext(summary_file)
+    out = os.path.join(output_dir, f"{stem}.{part_name(shard, worker)}{ext}")
+    rows = []
+    for name, done in iter_assigned(targets, "compare", shard, queue_dir, worker):
+        errors = compare_object(name, real_dir, rebound_dir, manual_dir, output_dir)
+        if errors is not None:
+            # The row is on disk before the object is marked done, so a node dying mid-shard loses nothing
+            row = build_summary([name], [errors[0]], [errors[1]])
+            row.to_csv(out, mode="a", header=not os.path.exists(out), index=False)
+            rows.append(row)
+        # Missing inputs are final for this stage, so the object is still marked done
+        done(ok=True)
+
+    if not rows:
+        print("[INFO] Compare shard finished: no objects")
+        return None
+
+    print(f"[INFO] Compare shard finished: {len(rows)} objects -> {out}")
+    return pd.concat(rows, ignore_index=True)
+
+
+def part_name(shard=None, worker=None):
+    """Summary part-file suffix for this node"""
+    if worker:
+        return f"{PART_PREFIX}{_safe(worker)}"
+    if shard:
+        return f"{PART_PREFIX}{shard[0]}-of-{shard[1]}"
+    return f"{PART_PREFIX}{_safe(socket.gethostname())}-{os.getpid()}"
+
+
+def merge_summaries(analysis_dir, summary_file="Unified_Model_Comparison_Advanced.csv", cleanup=False):
+    """Concatenate every <summary>.part-*.csv into the unified summary (last write per object wins).
+
+    The MEGNO / Lyapunov columns of the last chaos run are joined on, as in
+    the unsharded compare.
+    """
+    import pandas as pd
+    from chaos import CHAOS_FILE, CHAOS_COLUMNS
+
+    stem, ext = os.path.splitext(summary_file)
+    parts = sorted(glob.glob(os.path.join(analysis_dir, f"{stem}.{PART_PREFIX}*{ext}")), key=os.path.getmtime)
+    if not parts:
+        print("No summary parts found.")
+        return None
+
+    merged = pd.concat([pd.read_csv(p) for p in parts], ignore_index=True)
+    merged = merged.drop_duplicates("object", keep="last").sort_values("object", ignore_index=True)
+    chaos_path = os.path.join(analysis_dir, CHAOS_FILE)
+    if os.path.exists(chaos_path):
+        merged = merged.drop(columns=[c for c in CHAOS_COLUMNS if c in merged.columns])
+        merged = merged.merge(pd.read_csv(chaos_path), on="object", how="left")
+    out = os.path.join(analysis_dir, summary_file)
+    merged.to_csv(out, index=False)
+    print(f"Merged {len(parts)} parts ({len(merged)} objects) into {out}")
+
+    if cleanup:
+        for p in parts:
+            os.remove(p)
+    return merged
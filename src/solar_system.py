@@ -0,0 +1,35 @@
+"""Sun + planets setup shared by the multi-body (test-particle) simulations."""
+
+import numpy as np
+
+# Osculating elements (deg) at 2025-01-01 and masses in Msun
+planets = {
+    'Mercury': {'a': 0.387, 'e': 0.206, 'i': 7.0, 'om': 48.3, 'w': 29.1, 'ma': 174.8, 'm': 1.660e-7},
+    'Venus':   {'a': 0.723, 'e': 0.007, 'i': 3.4, 'om': 76.7, 'w': 54.9, 'ma': 50.1, 'm': 2.448e-6},
+    'Earth':   {'a': 1.000, 'e': 0.017, 'i': 0.0,  'om': 0.0,  'w': 102.9, 'ma': 100.5, 'm': 3.003e-6},
+    'Mars':    {'a': 1.524, 'e': 0.093, 'i': 1.85, 'om': 49.6, 'w': 286.5, 'ma': 19.4, 'm': 3.227e-7},
+    'Jupiter': {'a': 5.204, 'e': 0.049, 'i': 1.3,  'om': 100.6,'w': 273.9, 'ma': 20.0, 'm': 9.548e-4}
+}
+
+
+def planet_simulation():
+    """Simulation holding the Sun and the massive planets; N_active is set so
+    anything added afterwards is a test particle"""
+    import rebound
+
+    sim = rebound.Simulation()
+    sim.units = ('AU', 'day', 'Msun')
+    sim.add(m=1.0)
+
+    for el in planets.values():
+        sim.add(
+            m=el['m'],
+            a=el['a'], e=el['e'],
+            inc=np.radians(el['i']),
+            Omega=np.radians(el['om']),
+            omega=np.radians(el['w']),
+            M=np.radians(el['ma'])
+        )
+    sim.N_active = sim.N
+    sim.testparticle_type = 0
+    return sim
@@ -0,0 +1,226 @@
+"""Streaming pipeline: fetch -> parse -> propagate -> compare -> summarise.
+
+Stages are chained generators. Each stage can run in its own thread behind a
+bounded queue, so a slow consumer blocks the producer (backpressure) and at
+most `queue_size` batches of `batch_size` objects are in flight at any time,
+whatever the catalog size. Nothing is written between stages. Only the final
+summary CSV goes to disk, and running totals are printed as batches finish.
+
+Usage:
+    python src/cli.py stream --batch-size 256
+    python src/stream.py --source sbdb --targets targets_english.txt --limit 0
+"""
+
+import os
+import sys
+import json
+import queue
+import threading
+import argparse
+import numpy as np
+from datetime import datetime, timedelta
+
+import trajstore
+from elements import ELEMENT_KEYS, fill_conic
+from ephemeris import jd_from_date
+from epochs import advance
+from universal import propagate_batch
+
+ANALYSIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "analysis")
+
+start_date = datetime(2025, 1, 1)
+end_date = datetime(2044, 12, 31)
+delta_days = 5
+
+_DONE = object()
+
+
+# -------------------- Plumbing --------------------
+def threaded(items, maxsize=4):
+    """Run an iterator in a background thread behind a bounded queue"""
+    q = queue.Queue(maxsize=maxsize)
+    failure = []
+
+    def worker():
+        try:
+            for item in items:
+                q.put(item)
+        except BaseException as exc:
+            failure.append(exc)
+        finally:
+            q.put(_DONE)
+
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        item = q.get()
+        if item is _DONE:
+            break
+        yield item
+    if failure:
+        raise failure[0]
+
+
+def batched(items, size):
+    """Group an iterator into lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# -------------------- Stages --------------------
+def fetch_stage(targets, source="local", data_dir="data"):
+    """Yield (name, SBDB JSON) per target, from data_dir or the SBDB API"""
+    if source == "sbdb":
+        from api_Test import fetch_sbdb, extract_numeric_id, normalize_name
+
+    for target in targets:
+        name = target.replace(" ", "_")
+        try:
+            if source == "sbdb":
+                data = fetch_sbdb(extract_numeric_id(target) or normalize_name(target.replace("_", " ")))
+            else:
+                path = os.path.join(data_dir, f"{name}.json")
+                if not os.path.exists(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except Exception as exc:
+            print(f"[ERROR] Could not fetch {target}: {exc}")
+            continue
+        yield name, data
+
+
+def parse_stage(records):
+    """Yield (name, elements dict) for every record with a complete element set"""
+    for name, data in records:
+        try:
+            el = {e['name']: float(e['value']) for e in data['orbit']['elements'] if e.get('value') is not None}
+            el = fill_conic(el)
+            el = {key: el[key] for key in ELEMENT_KEYS + ["q"]}
+            el["epoch"] = float(data['orbit']['epoch'])
+        except (KeyError, TypeError, ValueError):
+            print(f"[WARNING] Skipping {name}: no orbital elements")
+            continue
+        yield name, el
+
+
+def propagate_stage(batches, times):
+    """Yield (names, states) with states shaped (batch, epochs, 6), two-body propagation in one array pass
+    (any mix of elliptic, parabolic and hyperbolic orbits)"""
+    times = np.asarray(times, dtype=float)
+    start_jd = jd_from_date(start_date)
+    for batch in batches:
+        names = [name for name, _ in batch]
+        cols = {key: np.array([el[key] for _, el in batch]) for key in ELEMENT_KEYS + ["q", "epoch"]}
+        # Move every ma from its own epoch to start_date so the batch starts synchronized
+        cols["ma"] = advance(cols, start_jd)
+        del cols["epoch"]
+        yield names, propagate_batch(**cols, times=times)
+
+
+def load_reference(real_dir, epoch_dates):
+    """Reference lookup: name -> (epoch indices, real heliocentric distances) from results/real"""
+    import pandas as pd
+
+    index = {d: k for k, d in enumerate(epoch_dates)}
+
+    def reference(name):
+        path = os.path.join(real_dir, f"{name}_Real.csv")
+        if not trajstore.exists(path):
+            return None
+        real = trajstore.read_table(path, usecols=["datetime_str", "x", "y", "z"])
+        dates = pd.to_datetime(real["datetime_str"].str.replace("A.D. ", "", regex=False)).dt.date
+        idx = np.array([index.get(d, -1) for d in dates])
+        keep = idx >= 0
+        r = np.sqrt(real.x**2 + real.y**2 + real.z**2).to_numpy()
+        return idx[keep], r[keep]
+
+    return reference
+
+
+def compare_stage(batches, reference):
+    """Yield per-batch summary DataFrames (metrics of |r_model - r_real| against the reference)"""
+    import pandas as pd
+
+    if ANALYSIS_DIR not in sys.path:
+        sys.path.insert(0, ANALYSIS_DIR)
+    from metrics import stack_errors, compute_metrics, classify
+
+    for names, states in batches:
+        kept, errors = [], []
+        r_model = np.linalg.norm(states[..., :3], axis=2)
+        for k, name in enumerate(names):
+            ref = reference(name)
+            if ref is None or len(ref[0]) < 10:
+                continue
+            idx, r_real = ref
+            kept.append(name)
+            errors.append(np.abs(r_model[k, idx] - r_real))
+
+        if not kept:
+            continue
+
+        m = compute_metrics(stack_errors(errors))
+        yield pd.DataFrame({
+            "object": kept,
+            "rms_error": m["rms"],
+            "ratio": m["ratio"],
+            "volatility": m["volatility"],
+            "slope": m["slope"],
+            "r2": m["r_squared"],
+            "class": classify(m["ratio"], m["volatility"], m["r_squared"]),
+        })
+
+
+def summarise(frames, output_path=None):
+    """Consume summary batches, print running totals and write the final table once"""
+    import pandas as pd
+
+    parts, total = [], 0
+    for frame in frames:
+        parts.append(frame)
+        total += len(frame)
+        counts = ", ".join(f"{c}: {n}" for c, n in frame["class"].value_counts().items())
+        print(f"[SUMMARY] +{len(frame)} objects (total {total}) — {counts}")
+
+    summary = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        summary.to_csv(output_path, index=False)
+        print(f"Summary saved to: {output_path}")
+    return summary
+
+
+# -------------------- Pipeline --------------------
+def run_pipeline(targets, source="local", data_dir="data", real_dir=os.path.join("results", "real"),
+                 output_path=None, batch_size=256, queue_size=4):
+    """Wire the stages together; fetch and propagation run in their own threads"""
+    times = np.arange(0, (end_date - start_date).days + delta_days, delta_days)
+    epoch_dates = [(start_date + timedelta(days=int(t))).date() for t in times]
+
+    records = threaded(fetch_stage(targets, source, data_dir), maxsize=queue_size * batch_size)
+    elements = batched(parse_stage(records), batch_size)
+    states = threaded(propagate_stage(elements, times), maxsize=queue_size)
+    frames = compare_stage(states, load_reference(real_dir, epoch_dates))
+    return summarise(frames, output_path)
+
+
+if __name__ == "__main__":
+    from rebound_check import read_targets
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default="targets_english.txt")
+    parser.add_argument("--limit", type=int, default=100, help="first N targets (0 = all)")
+    parser.add_argument("--source", choices=["local", "sbdb"], default="local")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queue-size", type=int, default=4)
+    parser.add_argument("--out", default=os.path.join("results", "analysis", "unified", "Stream_Summary.csv"))
+    args = parser.parse_args()
+
+    run_pipeline(read_targets(args.targets, args.limit), args.source, output_path=args.out,
+                 batch_size=args.batch_size, queue_size=args.queue_size)
@@ -1,9 +1,10 @@
 """ Run this script to convert accented characters in targets.txt to English equivalents. """
 
+import sys
 import unicodedata
 
-# Path to your targets.txt file
-input_file = r"C:\Users\JASMINE\Desktop\RnD_asteroid\targets.txt"
+# Path to your targets.txt file (first argument, default: ./targets.txt)
+input_file = sys.argv[1] if len(sys.argv) > 1 else "targets.txt"
 output_file = input_file.replace(".txt", "_english.txt")
 
 def to_english(text):
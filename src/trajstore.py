@@ -0,0 +1,400 @@
+"""Compressed trajectory store: one zip container per results directory.
+
+Each trajectory CSV in a directory (e.g. 1_Ceres_Rebound.csv) becomes a set
+of members in <dir>/trajectories.trz, one per chunk of CHUNK_ROWS epochs, so
+a single object or a range of epochs decodes without touching the rest.
+
+Per chunk and column:
+    float columns       lossless: delta of the IEEE-754 bit patterns
+    x..z / vx..vz       with a tolerance: quantized to a grid of 2*tol, then
+                        second-order delta (smooth orbits -> tiny integers)
+    integer columns     delta
+    anything else       JSON list (dates/strings compress well under zlib)
+Deltas are zigzag-encoded, narrowed to the smallest integer width that
+fits, byte-shuffled and zlib-compressed.
+
+The tolerance is given in km for positions; velocities use the same number
+in km/day. The worst decoded error per object is measured at pack time and
+kept in the index.
+
+Readers call exists()/read_table() with the usual CSV path. The CSV is read
+if it is still there, otherwise the store. Without a tolerance the stored
+floats are bit-identical to the values written in the CSV. Each store is
+opened and its index parsed once per process, and reopened only when the
+archive's mtime or size changes.
+
+Writes append the new chunks and a new index.json to the archive (the
+last index.json wins), so existing tables are never copied. Chunks of a
+replaced table stay behind as dead space until it exceeds the live data,
+at which point the store is compacted into a fresh archive.
+
+Usage:
+    python src/trajstore.py pack results/rebound --tolerance-km 1 --remove-csv
+    python src/trajstore.py unpack results/rebound
+"""
+
+import os
+import io
+import json
+import zlib
+import struct
+import zipfile
+import argparse
+import warnings
+import numpy as np
+
+STORE_FILE = "trajectories.trz"
+INDEX_MEMBER = "index.json"
+CHUNK_ROWS = 256
+
+KM_PER_AU = 149597870.7
+POSITION_COLUMNS = ["x", "y", "z"]
+VELOCITY_COLUMNS = ["vx", "vy", "vz"]
+
+_HEADER = struct.Struct("<BBI")     # kind, integer width, payload length
+_FLOAT, _QUANT, _INT, _JSON = range(4)
+
+COMPACT_SLACK = 1 << 20     # dead bytes tolerated on top of the live data before compacting
+_OPEN = {}                  # absolute store path -> ((mtime_ns, size), ZipFile, index)
+
+
+# -------------------- Codec --------------------
+def _delta(a, order):
+    for _ in range(order):
+        a = np.concatenate([a[:1], np.diff(a)])
+    return a
+
+
+def _undelta(a, order):
+    for _ in range(order):
+        a = np.cumsum(a, dtype=np.int64)
+    return a
+
+
+def _pack_ints(d):
+    """Zigzag, narrow to 1/2/4/8 bytes and byte-shuffle an int64 array"""
+    z = ((d << 1) ^ (d >> 63)).view(np.uint64)
+    top = int(z.max()) if len(z) else 0
+    width = next(w for w in (1, 2, 4, 8) if top < 1 << (8 * w))
+    raw = z.astype(f"<u{width}").view(np.uint8).reshape(-1, width).T
+    return width, raw.tobytes()
+
+
+def _unpack_ints(width, payload, n):
+    raw = np.frombuffer(payload, dtype=np.uint8).reshape(width, n).T.copy()
+    z = raw.view(f"<u{width}").ravel().astype(np.uint64)
+    return (z >> np.uint64(1)).view(np.int64) ^ -(z & np.uint64(1)).view(np.int64)
+
+
+def _encode_column(values, step):
+    """(kind, width, payload) for one chunk of one column"""
+    if values.dtype.kind == "f":
+        if step is not None and np.isfinite(values).all():
+            q = np.rint(values / step).astype(np.int64)
+            return (_QUANT, *_pack_ints(_delta(q, 2)))
+        bits = np.ascontiguousarray(values, dtype="<f8").view(np.int64)
+        return (_FLOAT, *_pack_ints(_delta(bits, 1)))
+    if values.dtype.kind in "iu":
+        return (_INT, *_pack_ints(_delta(values.astype(np.int64), 1)))
+    items = [None if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in values.tolist()]
+    return _JSON, 0, json.dumps(items).encode("utf-8")
+
+
+def _decode_column(kind, width, payload, n, step):
+    if kind == _QUANT:
+        return _undelta(_unpack_ints(width, payload, n), 2) * step
+    if kind == _FLOAT:
+        return _undelta(_unpack_ints(width, payload, n), 1).view("<f8")
+    if kind == _INT:
+        return _undelta(_unpack_ints(width, payload, n), 1)
+    return np.array([np.nan if v is None else v for v in json.loads(payload)], dtype=object)
+
+
+def _encode_chunk(df, steps):
+    out = io.BytesIO()
+    for col in df.columns:
+        kind, width, payload = _encode_column(df[col].to_numpy(), steps.get(col))
+        out.write(_HEADER.pack(kind, width, len(payload)))
+        out.write(payload)
+    return zlib.compress(out.getvalue(), 6)
+
+
+def _decode_chunk(blob, columns, n, steps):
+    data = zlib.decompress(blob)
+    cols, pos = {}, 0
+    for col in columns:
+        kind, width, size = _HEADER.unpack_from(data, pos)
+        pos += _HEADER.size
+        cols[col] = _decode_column(kind, width, data[pos:pos + size], n, steps.get(col))
+        pos += size
+    return cols
+
+
+def column_steps(columns, tolerance_km=None):
+    """Quantization step per state column (2 * tolerance, in AU or AU/day)"""
+    if not tolerance_km:
+        return {}
+    step = 2.0 * tolerance_km / KM_PER_AU
+    return {c: step for c in POSITION_COLUMNS + VELOCITY_COLUMNS if c in columns}
+
+
+# -------------------- Store --------------------
+def store_path(directory):
+    return os.path.join(directory, STORE_FILE)
+
+
+def _open_store(directory):
+    """(ZipFile, index) of the directory's store, reopened only when the archive changed"""
+    path = os.path.abspath(store_path(directory))
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _OPEN.get(path)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+    if cached:
+        cached[1].close()
+    zf = zipfile.ZipFile(path)
+    index = json.loads(zf.read(INDEX_MEMBER))
+    _OPEN[path] = (key, zf, index)
+    return zf, index
+
+
+def _close_store(directory):
+    cached = _OPEN.pop(os.path.abspath(store_path(directory)), None)
+    if cached:
+        cached[1].close()
+
+
+def read_index(directory):
+    """The store's index (shared; do not modify)"""
+    if not os.path.exists(store_path(directory)):
+        return {"tables": {}}
+    return _open_store(directory)[1]
+
+
+def _member(stem, entry, k):
+    """Archive member of chunk k; a replaced table's chunks carry its revision"""
+    revision = entry.get("revision", 0)
+    return f"{stem}/r{revision}/{k}" if revision else f"{stem}/{k}"
+
+
+def encode_table(df, tolerance_km=None, chunk_rows=CHUNK_ROWS):
+    """(index entry, [chunk blobs]) for one trajectory DataFrame, with its measured error bound"""
+    import pandas as pd
+
+    steps = column_steps(df.columns, tolerance_km)
+    blobs = [_encode_chunk(df.iloc[s:s + chunk_rows], steps) for s in range(0, len(df), chunk_rows)]
+    entry = {
+        "columns": list(df.columns),
+        "dtypes": [str(t) for t in df.dtypes],
+        "rows": len(df),
+        "chunk_rows": chunk_rows,
+        "tolerance_km": tolerance_km,
+        "steps": steps,
+        "bytes": sum(len(b) for b in blobs),
+    }
+
+    decoded = pd.DataFrame(_decode_blobs(entry, blobs))
+    entry["max_position_error_km"] = _max_error(df, decoded, POSITION_COLUMNS)
+    entry["max_velocity_error_km_per_day"] = _max_error(df, decoded, VELOCITY_COLUMNS)
+    return entry, blobs
+
+
+def _max_error(original, decoded, columns):
+    columns = [c for c in columns if c in original.columns]
+    if not columns or original[columns].dtypes.map(lambda t: t.kind != "f").any():
+        return None
+    err = np.abs(original[columns].to_numpy() - decoded[columns].to_numpy().astype(float))
+    return float(np.nanmax(err, initial=0.0) * KM_PER_AU)
+
+
+def _decode_blobs(entry, blobs, first_chunk=0):
+    parts = []
+    for k, blob in enumerate(blobs, first_chunk):
+        n = min(entry["chunk_rows"], entry["rows"] - k * entry["chunk_rows"])
+        parts.append(_decode_chunk(blob, entry["columns"], n, entry["steps"]))
+    return {c: np.concatenate([p[c] for p in parts]) if parts else np.array([]) for c in entry["columns"]}
+
+
+def write_tables(directory, tables, tolerance_km=None, chunk_rows=CHUNK_ROWS):
+    """Add or replace (stem, DataFrame) pairs in the directory's store; returns their index entries.
+
+    tables may be a generator. Everything is appended to the archive; if
+    writing fails, the archive's previous central directory is put back, so
+    the store reads as before.
+    """
+    path = store_path(directory)
+    index = {"tables": dict(read_index(directory)["tables"])}
+    fresh = not os.path.exists(path)
+    if not fresh:
+        # Appending overwrites the central directory: keep it to restore on failure
+        with zipfile.ZipFile(path) as zf:
+            start_dir = zf.start_dir
+        with open(path, "rb") as f:
+            f.seek(start_dir)
+            directory_bytes = f.read()
+    written = {}
+
+    try:
+        with warnings.catch_warnings():
+            # The new index.json shadows the previous one
+            warnings.filterwarnings("ignore", "Duplicate name", UserWarning)
+            with zipfile.ZipFile(path, "w" if fresh else "a", zipfile.ZIP_STORED) as out:
+                for stem, df in tables:
+                    entry, blobs = encode_table(df, tolerance_km, chunk_rows)
+                    if stem in index["tables"]:
+                        entry["revision"] = index["tables"][stem].get("revision", 0) + 1
+                    for k, blob in enumerate(blobs):
+                        out.writestr(_member(stem, entry, k), blob)
+                    index["tables"][stem] = written[stem] = entry
+                out.writestr(INDEX_MEMBER, json.dumps(index, indent=1), zipfile.ZIP_DEFLATED)
+    except BaseException:
+        if fresh:
+            os.remove(path)
+        else:
+            with open(path, "r+b") as f:
+                f.seek(start_dir)
+                f.write(directory_bytes)
+                f.truncate()
+        raise
+
+    live = sum(entry["bytes"] for entry in index["tables"].values())
+    if os.path.getsize(path) > 2 * live + COMPACT_SLACK:
+        compact(directory)
+    return written
+
+
+def compact(directory):
+    """Rewrite the store with only its live chunks and one index"""
+    path = store_path(directory)
+    zf, index = _open_store(directory)
+    index = {"tables": {stem: dict(entry) for stem, entry in index["tables"].items()}}
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_STORED) as out:
+        for stem, entry in index["tables"].items():
+            n_chunks = -(-entry["rows"] // entry["chunk_rows"])
+            blobs = [zf.read(_member(stem, entry, k)) for k in range(n_chunks)]
+            entry.pop("revision", None)
+            for k, blob in enumerate(blobs):
+                out.writestr(_member(stem, entry, k), blob)
+        out.writestr(INDEX_MEMBER, json.dumps(index, indent=1), zipfile.ZIP_DEFLATED)
+    _close_store(directory)
+    os.replace(tmp, path)
+
+
+def read_stored(directory, stem, rows=None, columns=None):
+    """Decode one table (optionally only rows=(start, stop)) into a DataFrame"""
+    import pandas as pd
+
+    zf, index = _open_store(directory)
+    entry = index["tables"][stem]
+    start, stop = rows or (0, entry["rows"])
+    stop = min(stop, entry["rows"])
+    size = entry["chunk_rows"]
+    first, last = start // size, max(start, stop - 1) // size
+    blobs = [zf.read(_member(stem, entry, k)) for k in range(first, last + 1)] if stop > start else []
+
+    df = pd.DataFrame(_decode_blobs(entry, blobs, first))
+    for col, dtype in zip(entry["columns"], entry["dtypes"]):
+        df[col] = df[col].astype(dtype) if dtype != "object" else df[col]
+    df = df.iloc[start - first * size: stop - first * size].reset_index(drop=True)
+    return df[columns] if columns else df
+
+
+# -------------------- Reader API (CSV or store) --------------------
+def _split(path):
+    directory, fname = os.path.split(path)
+    return directory, os.path.splitext(fname)[0]
+
+
+def exists(path):
+    """True if the CSV at path exists or its table is in the directory's store"""
+    if os.path.exists(path):
+        return True
+    directory, stem = _split(path)
+    return os.path.exists(store_path(directory)) and stem in read_index(directory)["tables"]
+
+
+def read_table(path, usecols=None, rows=None):
+    """pd.read_csv(path) if the CSV exists, else the same table decoded from the store"""
+    import pandas as pd
+
+    if os.path.exists(path):
+        df = pd.read_csv(path, usecols=usecols)
+        if rows:
+            df = df.iloc[rows[0]:rows[1]].reset_index(drop=True)
+        return df
+    directory, stem = _split(path)
+    df = read_stored(directory, stem, rows)
+    return df[[c for c in df.columns if c in usecols]] if usecols else df
+
+
+def list_tables(directory, suffix):
+    """CSV paths in directory ending in suffix, whether stored as CSV or in the store"""
+    names = {f for f in os.listdir(directory) if f.endswith(suffix)} if os.path.isdir(directory) else set()
+    if os.path.exists(store_path(directory)):
+        names |= {f"{stem}.csv" for stem in read_index(directory)["tables"] if f"{stem}.csv".endswith(suffix)}
+    return [os.path.join(directory, f) for f in sorted(names)]
+
+
+# -------------------- Pack / unpack --------------------
+def pack_dir(directory, tolerance_km=None, chunk_rows=CHUNK_ROWS, remove_csv=False):
+    """Move every CSV in directory into its store; returns a per-object size / error report"""
+    import pandas as pd
+
+    fnames = sorted(f for f in os.listdir(directory) if f.endswith(".csv"))
+    sizes = {f[:-4]: os.path.getsize(os.path.join(directory, f)) for f in fnames}
+    # round_trip parsing keeps the stored floats bit-identical to the CSV text
+    tables = ((f[:-4], pd.read_csv(os.path.join(directory, f), float_precision="round_trip")) for f in fnames)
+    entries = write_tables(directory, tables, tolerance_km, chunk_rows)
+
+    report = pd.DataFrame([{
+        "object": stem,
+        "rows": entry["rows"],
+        "csv_bytes": sizes[stem],
+        "stored_bytes": entry["bytes"],
+        "ratio": sizes[stem] / max(entry["bytes"], 1),
+        "max_position_error_km": entry["max_position_error_km"],
+        "max_velocity_error_km_per_day": entry["max_velocity_error_km_per_day"],
+    } for stem, entry in entries.items()])
+
+    if remove_csv:
+        for f in fnames:
+            os.remove(os.path.join(directory, f))
+    if len(report):
+        print(f"[INFO] Packed {len(report)} tables into {store_path(directory)}: "
+              f"{report.csv_bytes.sum() / 1e6:.1f} MB -> {report.stored_bytes.sum() / 1e6:.2f} MB")
+    return report
+
+
+def unpack_dir(directory, output_dir=None):
+    """Write every stored table back out as CSV"""
+    output_dir = output_dir or directory
+    os.makedirs(output_dir, exist_ok=True)
+    stems = list(read_index(directory)["tables"])
+    for stem in stems:
+        read_stored(directory, stem).to_csv(os.path.join(output_dir, f"{stem}.csv"), index=False)
+    print(f"[INFO] Unpacked {len(stems)} tables into {output_dir}/")
+    return stems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pack", help="compress the CSVs of a results directory")
+    p.add_argument("directory")
+    p.add_argument("--tolerance-km", type=float, default=None, help="quantize states (default: lossless)")
+    p.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    p.add_argument("--remove-csv", action="store_true")
+
+    p = sub.add_parser("unpack", help="write the stored tables back as CSV")
+    p.add_argument("directory")
+    p.add_argument("--out", default=None)
+
+    args = parser.parse_args()
+    if args.command == "pack":
+        report = pack_dir(args.directory, args.tolerance_km, args.chunk_rows, args.remove_csv)
+        print(report.to_string(index=False))
+    else:
+        unpack_dir(args.directory, args.out)
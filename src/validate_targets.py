@@ -0,0 +1,236 @@
+"""Validate and deduplicate a target list against the local catalog before fetching/simulating.
+
+Each line is cleaned (tabs, repeated and non-breaking spaces) and reduced
+to an identity key:
+    numbered object        '4462\t1989 RP', '1 Ceres', '5131'  -> '#4462', '#1', '#5131'
+    provisional designation '2023 DW', '(2023 DW)', 'A801 AA'  -> '2023 DW', ...
+    numbered comet         '1P/Halley', '1P', '2I/Borisov (C/2019 Q4)' -> '1P', '1P', '2I'
+    provisional comet      'C/2020 F3', 'C/2020 F3 (NEOWISE)'  -> 'C/2020 F3'
+    bare name              'Ceres'                             -> 'name:ceres'
+Keys go into a dict (hash index), so duplicates come out in one pass over
+the 25k lines. Bare names and designations that belong to a numbered entry
+(asteroid or comet) in the list or the catalog are also caught. Comet names
+('ATLAS', 'PANSTARRS') are not unique, so only numbered comets alias theirs. Every line is then checked
+against the asteroids_master.json keys.
+
+Output: a clean, deduplicated list (first occurrence wins, order kept)
+and a CSV report with one row per dropped or unmatched line.
+
+Usage:
+    python src/validate_targets.py targets_english.txt --catalog asteroids_master.json
+    python src/cli.py validate --catalog-only
+"""
+
+import os
+import re
+import csv
+import json
+import argparse
+import unicodedata
+
+PROVISIONAL = re.compile(r"^(?:\d{4}|A\d{3}) [A-Z]{2}\d*$|^\d{4} (?:P-L|T-[123])$")
+NUMBERED = re.compile(r"^(\d+)(?: (.+))?$")
+CATALOG_NAME = re.compile(r"^(?:(\d+) ?)?([^(]*?)\s*(?:\((.+)\))?$")
+# '1P/Halley', '1I/ʻOumuamua (A/2017 U1)', 'C/2020 F3 (NEOWISE)', 'P/2019 LD2'
+COMET = re.compile(r"^(?:(\d+[PDI])(?:[/ ]([^(]+?))?|([PCDXAI]/\d{4} [A-Z]{1,2}\d*(?:-[A-Z])?))(?: ?\((.+)\))?$")
+NUMBERED_COMET = re.compile(r"^\d+[PDI]$")
+
+REPORT_COLUMNS = ["line", "entry", "key", "issue", "detail"]
+
+
+# -------------------- Parsing --------------------
+def clean_line(line):
+    """Collapse tabs and all Unicode whitespace (incl. NBSP) into single spaces"""
+    return " ".join(line.split())
+
+
+def _name_key(name):
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return "name:" + ascii_name.casefold()
+
+
+def _permanent(key):
+    """True for keys of numbered asteroids and comets, which names and designations resolve to"""
+    return key.startswith("#") or bool(NUMBERED_COMET.match(key))
+
+
+def _parse_comet(entry):
+    """(key, name, designation) of a comet / interstellar designation, or None"""
+    m = COMET.match(entry)
+    if not m:
+        return None
+    numbered, name, provisional, paren = m.groups()
+    if numbered:
+        return numbered, name, paren
+    return provisional, paren, provisional
+
+
+def parse_entry(entry):
+    """(key, number, name, designation) for a cleaned entry; key is None if it is malformed.
+
+    number is only set for numbered asteroids.
+    """
+    comet = _parse_comet(entry)
+    if comet:
+        key, name, designation = comet
+        return key, None, name, designation
+
+    entry = entry.strip("()")
+    if not entry or not any(ch.isalnum() for ch in entry) or any(ord(ch) < 32 for ch in entry):
+        return None, None, None, None
+
+    if PROVISIONAL.match(entry):
+        return entry, None, None, entry
+
+    m = NUMBERED.match(entry)
+    if m:
+        number, rest = m.group(1), m.group(2)
+        if rest and PROVISIONAL.match(rest):
+            return f"#{int(number)}", int(number), None, rest
+        return f"#{int(number)}", int(number), rest, None
+
+    if entry[0].isdigit():
+        return None, None, None, None
+    return _name_key(entry), None, entry, None
+
+
+# -------------------- Catalog index --------------------
+def load_catalog_index(catalog_file):
+    """Map every key a catalog row can be addressed by (number, name, designation) to its full name"""
+    if not catalog_file or not os.path.exists(catalog_file):
+        print(f"[WARNING] Catalog {catalog_file} not found; catalog checks skipped")
+        return None
+
+    with open(catalog_file, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+
+    index = {}
+    for row in rows:
+        for key in catalog_keys(row.get("name", "")):
+            index.setdefault(key, row["name"])
+    return index
+
+
+def catalog_keys(full_name):
+    """Every key a catalog name can be addressed by, identity key first ([] if unparseable)"""
+    full_name = clean_line(full_name)
+    comet = _parse_comet(full_name)
+    if comet:
+        key, name, designation = comet
+        keys = [key]
+        if name and _permanent(key):
+            keys.append(_name_key(name))
+        if designation and designation != key:
+            keys.append(designation)
+        return keys
+    if PROVISIONAL.match(full_name.strip("()")):
+        return [full_name.strip("()")]
+
+    m = CATALOG_NAME.match(full_name)
+    if not m:
+        return []
+    number, name, designation = m.groups()
+    primary = f"#{int(number)}" if number else designation
+    keys = [primary] if primary else []
+    if name:
+        key = _name_key(name) if number else parse_entry(name)[0]
+        if key and key not in keys:
+            keys.append(key)
+    if designation and designation not in keys:
+        keys.append(designation)
+    return keys
+
+
+# -------------------- Validation --------------------
+def validate_targets(lines, catalog=None):
+    """Return (clean entries, report rows) for the raw target lines"""
+    seen = {}       # identity key -> (line number, entry)
+    aliases = {}    # name / designation key -> numbered key
+    parsed = []
+    report = []
+
+    for lineno, raw in enumerate(lines, 1):
+        entry = clean_line(raw)
+        key, number, name, designation = parse_entry(entry)
+        if key is None:
+            # Whitespace-only lines are blank, like empty ones
+            if entry:
+                report.append([lineno, raw.rstrip("\r\n"), "", "malformed", ""])
+            continue
+        parsed.append((lineno, entry, key))
+        if _permanent(key):
+            if name:
+                aliases.setdefault(_name_key(name), key)
+            if designation and designation != key:
+                aliases.setdefault(designation, key)
+
+    # Bare names / designations resolve to a numbered key from the list or the catalog
+    if catalog:
+        for alias, full in catalog.items():
+            keys = catalog_keys(full)
+            if keys and _permanent(keys[0]) and alias != keys[0]:
+                aliases.setdefault(alias, keys[0])
+
+    clean = []
+    for lineno, entry, key in parsed:
+        key = aliases.get(key, key)
+        if key in seen:
+            first_line, first_entry = seen[key]
+            same = first_entry.strip("()").casefold() == entry.strip("()").casefold()
+            issue = "duplicate" if same else "alias_duplicate"
+            report.append([lineno, entry, key, issue, f"line {first_line}: {first_entry}"])
+            continue
+        seen[key] = (lineno, entry)
+        clean.append(entry)
+        if catalog is not None and key not in catalog:
+            report.append([lineno, entry, key, "not_in_catalog", ""])
+
+    report.sort(key=lambda row: row[0])
+    return clean, report
+
+
+def run(targets_file, catalog_file="asteroids_master.json", output_file=None, report_file=None,
+        catalog_only=False):
+    """Validate targets_file and write the clean list (default: <targets>_clean.txt) and the report"""
+    with open(targets_file, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.readlines()
+
+    catalog = load_catalog_index(catalog_file)
+    clean, report = validate_targets(lines, catalog)
+
+    if catalog_only and catalog is not None:
+        missing = {row[1] for row in report if row[3] == "not_in_catalog"}
+        clean = [entry for entry in clean if entry not in missing]
+
+    output_file = output_file or targets_file.replace(".txt", "_clean.txt")
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.writelines(entry + "\n" for entry in clean)
+
+    if report_file:
+        os.makedirs(os.path.dirname(report_file) or ".", exist_ok=True)
+        with open(report_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_COLUMNS)
+            writer.writerows(report)
+
+    counts = {}
+    for row in report:
+        counts[row[3]] = counts.get(row[3], 0) + 1
+    print(f"[INFO] {len(lines)} lines -> {len(clean)} clean targets ({output_file})")
+    for issue, n in sorted(counts.items()):
+        print(f"  {issue:<16} {n}")
+    if report_file:
+        print(f"Report saved to: {report_file}")
+    return clean, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="?", default="targets_english.txt")
+    parser.add_argument("--catalog", default="asteroids_master.json")
+    parser.add_argument("--out", default=None, help="clean list (default: <targets>_clean.txt)")
+    parser.add_argument("--report", default=os.path.join("results", "analysis", "Target_Validation_Report.csv"))
+    parser.add_argument("--catalog-only", action="store_true", help="drop targets with no catalog row")
+    args = parser.parse_args()
+
+    run(args.targets, args.catalog, args.out, args.report, args.catalog_only)
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import kepler
+
+
+@pytest.mark.parametrize("warm", [False, True])
+@pytest.mark.parametrize("method", kepler.METHODS)
+@pytest.mark.parametrize("start", kepler.STARTERS)
+def test_high_eccentricity_converges(start, method, warm, capsys):
+    """Every starter / method pair converges for e in [0.9, 0.9999] over all M"""
+    e = np.linspace(0.9, 0.9999, 100)
+    M = np.tile(np.linspace(-np.pi, np.pi, 1001), (e.size, 1))
+    E, iterations = kepler.solve_grid(M, e, method=method, start=start, warm=warm)
+
+    residual = np.abs(E - e[:, None] * np.sin(E) - kepler.reduce_anomaly(M))
+    assert residual.max() < 1e-10
+    assert iterations.max() < kepler.DEFAULT_MAX_ITER
+    assert "[WARNING]" not in capsys.readouterr().out